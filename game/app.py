@@ -1,85 +1,193 @@
 # app.py
 import sys
+from functools import partial
+
 import pygame
 
 from logger_config import logger
 from ui.window_manager import WindowManager
 from ui.menu.menu import MenuState, draw_menu, handle_menu_event
 from ui.controller import handle_event
-from ui.renderer import draw_all
+from ui.bot_worker import BOT_MOVE_EVENT, BotWorker
+from ui.renderer import draw_all, next_frame_in
 from ui.screen_options import draw_options, handle_options_event
-from ui.screen_themes import draw_themes, handle_themes_event
 from model.game_state import GameState
-from rules.check_winner import check_winner
-from themes.theme_loader import load_themes
+from rules.bot import make_bot
+from themes.assets import ASSET_READY_EVENT, assets
+from config import BOT_ENGINE, BOT_PLAYER, IDLE_WAIT_MS
+
+
+def _idle_timeout_ms(mode: str, menu_state) -> int:
+    """How long the loop may sleep: until the next animation frame or IDLE_WAIT_MS."""
+    if mode == "game":
+        wait = next_frame_in(
+            menu_state.player_x_image,
+            menu_state.player_o_image,
+            pygame.time.get_ticks(),
+        )
+        if wait is not None:
+            return min(wait, IDLE_WAIT_MS)
+    return IDLE_WAIT_MS
+
+
+def _undo_redo(event, state, vs_bot: bool, bot_worker) -> None:
+    """Ctrl+Z undoes a move, Ctrl+Y (or Ctrl+Shift+Z) redoes one.
+
+    Against the bot a step goes back to (or forward to) the human's turn,
+    so it takes back the bot's reply together with the move before it.
+    """
+    redo = event.key == pygame.K_y or event.mod & pygame.KMOD_SHIFT
+    step = state.redo if redo else state.undo
+
+    # a search on the old position would answer the wrong board
+    bot_worker.cancel()
+    if step():
+        while vs_bot and state.current_player == BOT_PLAYER and step():
+            pass
+
+
+def _wait_for_events(timeout_ms: int) -> list:
+    """Sleep until an event arrives (input, resize, bot move) or the timeout."""
+    event = pygame.event.wait(max(timeout_ms, 1))
+    if event.type == pygame.NOEVENT:
+        return []
+    return [event]
 
 
-def run() -> None:
-    pygame.init()
+def run(max_frames: int | None = None) -> None:
+    """Run the game until it is closed (or after max_frames frames)."""
+    # only what the game uses: pygame.init() would also open the audio
+    # device and scan for joysticks before the first frame
+    pygame.display.init()
+    pygame.font.init()
     logger.info("Game started")
 
     win = WindowManager()
+    # also starts the SDL timer behind pygame.time.get_ticks()
     clock = pygame.time.Clock()
 
     state = GameState()
     menu_state = MenuState()
 
-    themes = load_themes()
+    # the theme list and the themes screen functions are loaded when that
+    # screen is first opened and the bot engine is built for its first
+    # move, both after the menu is shown
+    themes = None
+    bot_worker = BotWorker(partial(make_bot, BOT_ENGINE))
 
     mode = "menu"
+    # event that woke an idle wait, handled on the next frame
+    pending = []
+    frames = 0
 
     while state.running:
-        for event in pygame.event.get():
+        for event in pending + pygame.event.get():
+            if event.type == pygame.VIDEORESIZE:
+                win.on_resize()
+                continue
+            if event.type == pygame.VIDEOEXPOSE:
+                win.invalidate()
+                continue
+
+            if event.type == ASSET_READY_EVENT:
+                # placeholder marks are replaced once the theme images are in;
+                # themes are only applied from the themes screen, so its
+                # modules are loaded by then
+                if themes is not None:
+                    poll_pending_theme(menu_state)
+                continue
+
+            if event.type == BOT_MOVE_EVENT:
+                if mode == "game" and bot_worker.accept(event):
+                    played = len(state.moves)
+                    if event.move:
+                        state.apply_move(*event.move)
+                    if len(state.moves) == played:
+                        # the bot failed or chose an illegal cell; asking
+                        # again would fail the same way on every frame
+                        logger.error("Game: bot could not move, back to main menu")
+                        mode = "menu"
+                continue
+
             if mode == "menu":
                 prev_mode = mode
                 mode = handle_menu_event(event, win, menu_state, mode, state)
                 if mode != prev_mode and mode == "game":
                     # apply board settings when starting game
-                    state.board_size = menu_state.board_size
-                    state.restart()
+                    state.apply_settings(menu_state.board_size, menu_state.win_length)
+                if mode == "themes" and themes is None:
+                    from themes.theme_loader import load_themes, poll_pending_theme
+                    from ui.screen_themes import draw_themes, handle_themes_event
+
+                    themes = load_themes()
             elif mode == "options":
                 mode = handle_options_event(event, win, menu_state, mode, state)
             elif mode == "themes":
                 mode = handle_themes_event(event, win, menu_state, mode, state, themes)
             else:
                 # game mode
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_ESCAPE:
+                    logger.info("Game: back to main menu")
+                    mode = "menu"
+                    continue
+                if (
+                    event.type == pygame.KEYDOWN
+                    and event.key in (pygame.K_z, pygame.K_y)
+                    and event.mod & pygame.KMOD_CTRL
+                ):
+                    _undo_redo(event, state, menu_state.vs_bot, bot_worker)
+                    continue
+                if bot_worker.busy and event.type == pygame.MOUSEBUTTONDOWN:
+                    continue  # board is locked while the bot thinks
                 handle_event(event, win, state)
 
+        if mode != "game" and bot_worker.busy:
+            bot_worker.cancel()
+
+        # bot thinks in the background, the loop keeps rendering
+        if (
+            mode == "game"
+            and menu_state.vs_bot
+            and state.winner is None
+            and state.current_player == BOT_PLAYER
+            and not bot_worker.busy
+        ):
+            bot_worker.request_move(state.board, state.current_player, state.win_length)
+
         if mode == "menu":
-            draw_menu(win.base_surface, menu_state)
+            dirty = draw_menu(win.base_surface, menu_state, win.dirty)
         elif mode == "options":
-            draw_options(win.base_surface, menu_state)
+            dirty = draw_options(win.base_surface, menu_state, win.dirty)
         elif mode == "themes":
-            draw_themes(win.base_surface, menu_state, themes)
+            dirty = draw_themes(win.base_surface, menu_state, themes, win.dirty)
         else:
-            # game mode
-
-            # if animated theme is active, choose current frame
-            if menu_state.animation_frames_x and menu_state.animation_frame_duration_ms > 0:
-                now = pygame.time.get_ticks()
-                frame_count = len(menu_state.animation_frames_x)
-                idx = (now // menu_state.animation_frame_duration_ms) % frame_count
-                menu_state.player_x_image = menu_state.animation_frames_x[idx]
-
-                if menu_state.animation_frames_o:
-                    idx_o = (now // menu_state.animation_frame_duration_ms) % len(
-                        menu_state.animation_frames_o
-                    )
-                    menu_state.player_o_image = menu_state.animation_frames_o[idx_o]
-
-            draw_all(
+            # game mode; animated themes pick their atlas frame from the time
+            dirty = draw_all(
                 win.base_surface,
                 state.board.data,
                 menu_state.player_x_image,
                 menu_state.player_o_image,
+                win.dirty,
+                pygame.time.get_ticks(),
             )
 
-        win.clear()
-        win.blit_scaled_centered()
-        pygame.display.flip()
+        # only regions that changed are scaled and sent to the display
+        win.present(dirty)
 
-        clock.tick(menu_state.fps)
+        frames += 1
+        if max_frames is not None and frames >= max_frames:
+            break
+
+        if dirty:
+            # something is changing: run at the configured frame rate
+            pending = []
+            clock.tick(menu_state.fps)
+        else:
+            # static scene: sleep instead of redrawing the same frame
+            pending = _wait_for_events(_idle_timeout_ms(mode, menu_state))
 
+    bot_worker.stop()
+    assets.close()
     logger.info("Game terminated")
     pygame.quit()
     sys.exit()
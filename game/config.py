@@ -10,4 +10,10 @@ O_COLOR = (70, 150, 220)
 
 LINE_WIDTH = 4
 MARK_WIDTH = 10
-FPS = 60
\ No newline at end of file
+FPS = 60
+IDLE_WAIT_MS = 1000   # longest sleep of the main loop while nothing changes
+
+# bot
+BOT_PLAYER = -1       # bot plays O, human always starts as X
+BOT_ENGINE = "solver"  # solved tables where available, iterative search otherwise
+BOT_TIME_BUDGET_MS = 500  # per-move thinking time of the iterative bot
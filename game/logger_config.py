@@ -9,26 +9,44 @@ LOG_DIR = os.path.abspath(os.path.join(BASE_DIR, "..", "logs"))
 
 os.makedirs(LOG_DIR, exist_ok=True)
 
+# lowest level written, e.g. GAME_LOG_LEVEL=DEBUG to trace every move
+LOG_LEVEL = os.environ.get("GAME_LOG_LEVEL", "INFO").upper()
+# GAME_LOG_ENQUEUE=1 moves sink I/O to a background thread, for slow
+# consoles or disks; each record is pickled for the queue though, which
+# costs the caller more than a plain write to a fast sink
+LOG_ENQUEUE = os.environ.get("GAME_LOG_ENQUEUE", "0") == "1"
+
 LOG_FORMAT = (
     "<green>{time:HH:mm:ss}</green> | <level>{level: <8}</level> | "
     "<cyan>{name}</cyan>:<cyan>{function}</cyan>:<cyan>{line}</cyan> - "
     "<level>{message}</level>"
 )
 
+_unknown_level = None
+try:
+    logger.level(LOG_LEVEL)
+except ValueError:
+    _unknown_level, LOG_LEVEL = LOG_LEVEL, "INFO"
+
 # console
 logger.add(
     sys.stderr,
-    level="DEBUG",
+    level=LOG_LEVEL,
     format=LOG_FORMAT,
+    enqueue=LOG_ENQUEUE,
 )
 
 # file
 logger.add(
     os.path.join(LOG_DIR, "game.log"),
-    level="DEBUG",
+    level=LOG_LEVEL,
     format=LOG_FORMAT,
     rotation="500 KB",
     retention=5,
+    enqueue=LOG_ENQUEUE,
 )
 
+if _unknown_level is not None:
+    logger.warning("Unknown GAME_LOG_LEVEL {!r}, using {}", _unknown_level, LOG_LEVEL)
+
 __all__ = ["logger"]
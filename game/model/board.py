@@ -1,36 +1,149 @@
 # model/board.py
 from config import GRID_SIZE
+from rules.symmetry import SYMMETRY_COUNT, symmetry_tables
 
 
 class Board:
+    """Square board stored as two bitmasks, one per player.
+
+    Cell (row, col) maps to bit ``row * size + col``. The bit is set in
+    ``x_mask`` when X (1) occupies the cell and in ``o_mask`` when O (-1) does.
+
+    ``hashes`` holds the Zobrist hash of the position under each of the 8
+    board symmetries and is updated incrementally by ``set``.
+    """
+
+    __slots__ = (
+        "size",
+        "full_mask",
+        "x_mask",
+        "o_mask",
+        "empty_count",
+        "hashes",
+        "_tables",
+        "_data",
+    )
+
     def __init__(self, size: int = GRID_SIZE):
         self.size = size
-        self.data = self._make(size)
+        self.full_mask = (1 << (size * size)) - 1
+        self.x_mask = 0
+        self.o_mask = 0
+        self.empty_count = size * size
+        self.hashes = (0,) * SYMMETRY_COUNT
+        self._tables = symmetry_tables(size)
+        self._data = None
 
-    def _make(self, size):
-        board = []
-        for _ in range(size):
-            row = []
+    @property
+    def data(self) -> list[list[int]]:
+        """Read-only 2D view with values -1, 0, 1 (rebuilt after each change)."""
+        if self._data is None:
+            size = self.size
+            x_mask = self.x_mask
+            o_mask = self.o_mask
+            data = []
+            bit = 1
             for _ in range(size):
-                row.append(0)
-            board.append(row)
-        return board
+                row = []
+                for _ in range(size):
+                    if x_mask & bit:
+                        row.append(1)
+                    elif o_mask & bit:
+                        row.append(-1)
+                    else:
+                        row.append(0)
+                    bit <<= 1
+                data.append(row)
+            self._data = data
+        return self._data
+
+    @property
+    def hash(self) -> int:
+        """Zobrist hash of the position as it is."""
+        return self.hashes[0]
+
+    @property
+    def canonical_hash(self) -> int:
+        """Zobrist hash shared by all rotations and reflections of the position."""
+        return min(self.hashes)
+
+    @property
+    def occupied_mask(self) -> int:
+        return self.x_mask | self.o_mask
+
+    def index(self, row: int, col: int) -> int:
+        return row * self.size + col
 
     def reset(self):
-        self.data = self._make(self.size)
+        self.x_mask = 0
+        self.o_mask = 0
+        self.empty_count = self.size * self.size
+        self.hashes = (0,) * SYMMETRY_COUNT
+        self._data = None
+
+    def copy(self) -> "Board":
+        board = Board.__new__(Board)
+        board.size = self.size
+        board.full_mask = self.full_mask
+        board.x_mask = self.x_mask
+        board.o_mask = self.o_mask
+        board.empty_count = self.empty_count
+        board.hashes = self.hashes
+        board._tables = self._tables
+        board._data = None
+        return board
 
     def get(self, row, col):
-        return self.data[row][col]
+        bit = 1 << (row * self.size + col)
+        if self.x_mask & bit:
+            return 1
+        if self.o_mask & bit:
+            return -1
+        return 0
 
     def set(self, row, col, value):
-        self.data[row][col] = value
+        cell = row * self.size + col
+        bit = 1 << cell
+        old = self.get(row, col)
+        was_empty = old == 0
+        if old != value:
+            hashes = self.hashes
+            if old:
+                keys = self._tables.x_keys if old == 1 else self._tables.o_keys
+                hashes = tuple(h ^ k for h, k in zip(hashes, keys[cell]))
+            if value:
+                keys = self._tables.x_keys if value == 1 else self._tables.o_keys
+                hashes = tuple(h ^ k for h, k in zip(hashes, keys[cell]))
+            self.hashes = hashes
+        x_mask = self.x_mask & ~bit
+        o_mask = self.o_mask & ~bit
+        if value == 1:
+            x_mask |= bit
+        elif value == -1:
+            o_mask |= bit
+        if value != 0:
+            if was_empty:
+                self.empty_count -= 1
+        elif not was_empty:
+            self.empty_count += 1
+        self.x_mask = x_mask
+        self.o_mask = o_mask
+        self._data = None
 
     def is_empty(self, row, col):
-        return self.data[row][col] == 0
+        return not (self.x_mask | self.o_mask) >> (row * self.size + col) & 1
 
     def is_full(self):
-        for row in self.data:
-            for cell in row:
-                if cell == 0:
-                    return False
-        return True
\ No newline at end of file
+        return self.empty_count == 0
+
+    def empty_cells(self) -> list[tuple[int, int]]:
+        """Return (row, col) of every empty cell in row-major order."""
+        size = self.size
+        free = self.full_mask & ~(self.x_mask | self.o_mask)
+        cells = []
+        while free:
+            low = free & -free
+            idx = low.bit_length() - 1
+            cells.append((idx // size, idx % size))
+            free ^= low
+        return cells
@@ -0,0 +1,167 @@
+# model/game_record.py
+# Compact binary game records for storage and analytics.
+#
+# A record file starts with the magic b"TTR1" and holds records back to
+# back, each a 4-byte header followed by one byte per move:
+#
+#     board_size (u8), win_length (u8), result (i8), move count (u8),
+#     move cells (u8 each, row * board_size + col, in play order)
+#
+# result is 1 (X won), -1 (O won), 0 (draw) or -128 (not finished).
+# Files are only ever appended to, and the reader memory-maps them, so
+# scanning millions of games does not load them into memory.
+import mmap
+import struct
+from pathlib import Path
+from typing import Iterator
+
+from logger_config import logger
+
+_MAGIC = b"TTR1"
+# board_size, win_length, result, move count
+_RECORD = struct.Struct("<BBbB")
+_UNFINISHED = -128
+
+# cell indexes and the move count must fit in one byte
+MAX_RECORD_BOARD_SIZE = 15
+
+
+class GameRecord:
+    """One finished (or abandoned) game: settings, result and moves.
+
+    moves holds flat cell indexes ``row * board_size + col``; X always
+    moves first. result is 1, -1, 0 or None for a game without a result.
+    """
+
+    __slots__ = ("board_size", "win_length", "result", "moves")
+
+    def __init__(self, board_size: int, win_length: int, result: int | None,
+                 moves: bytes) -> None:
+        self.board_size = board_size
+        self.win_length = win_length
+        self.result = result
+        self.moves = bytes(moves)
+
+    @classmethod
+    def from_state(cls, state) -> "GameRecord":
+        """Record of a GameState: its settings, winner and move history."""
+        return cls(state.board_size, state.win_length, state.winner, state.moves)
+
+    def encode(self) -> bytes:
+        if not 0 < self.board_size <= MAX_RECORD_BOARD_SIZE:
+            raise ValueError(f"Board size {self.board_size} does not fit a record")
+        result = _UNFINISHED if self.result is None else self.result
+        return _RECORD.pack(
+            self.board_size, self.win_length, result, len(self.moves)
+        ) + self.moves
+
+    def __repr__(self) -> str:
+        return (
+            f"GameRecord(board_size={self.board_size}, win_length={self.win_length}, "
+            f"result={self.result}, moves={list(self.moves)})"
+        )
+
+
+class GameRecordWriter:
+    """Appends records to a record file, creating it if needed.
+
+    Each record goes out in a single write, so a crash can at worst leave
+    a truncated last record; the reader skips it and the next writer
+    drops it before appending.
+    """
+
+    def __init__(self, path: Path | str) -> None:
+        self.path = Path(path)
+        self._fh = open(self.path, "ab")
+        size = self._fh.tell()
+        if size == 0:
+            self._fh.write(_MAGIC)
+            return
+
+        try:
+            end = _complete_end(self.path)
+        except ValueError:
+            self._fh.close()
+            raise
+        if end < size:
+            # new records must not land behind a half-written one
+            logger.warning(
+                f"Game records: dropping truncated record at the end of {self.path.name}"
+            )
+            self._fh.truncate(end)
+
+    def write(self, record: GameRecord) -> None:
+        self._fh.write(record.encode())
+
+    def flush(self) -> None:
+        self._fh.flush()
+
+    def close(self) -> None:
+        self._fh.close()
+
+    def __enter__(self) -> "GameRecordWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+def read_records(path: Path | str) -> Iterator[GameRecord]:
+    """Yield the records of a file one by one from a memory map."""
+    path = Path(path)
+    with open(path, "rb") as fh:
+        magic = fh.read(len(_MAGIC))
+        if not magic:
+            return  # created, header not flushed yet
+        if magic != _MAGIC:
+            raise ValueError(f"Not a game record file: {path}")
+        if fh.seek(0, 2) == len(_MAGIC):
+            return
+        data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        unpack_from = _RECORD.unpack_from
+        header_size = _RECORD.size
+        end = len(data)
+        pos = len(_MAGIC)
+        while pos + header_size <= end:
+            board_size, win_length, result, count = unpack_from(data, pos)
+            moves_end = pos + header_size + count
+            if moves_end > end:
+                break
+            yield GameRecord(
+                board_size,
+                win_length,
+                None if result == _UNFINISHED else result,
+                data[pos + header_size : moves_end],
+            )
+            pos = moves_end
+
+        if pos < end:
+            logger.warning(
+                f"Game records: ignoring truncated record at the end of {path.name}"
+            )
+    finally:
+        data.close()
+
+
+def _complete_end(path: Path) -> int:
+    """Offset just past the last complete record of an existing file."""
+    with open(path, "rb") as fh:
+        if fh.read(len(_MAGIC)) != _MAGIC:
+            raise ValueError(f"Not a game record file: {path}")
+        if fh.seek(0, 2) == len(_MAGIC):
+            return len(_MAGIC)
+        data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+
+    with data:
+        header_size = _RECORD.size
+        end = len(data)
+        pos = len(_MAGIC)
+        # only the move counts are read, records are not decoded
+        while pos + header_size <= end:
+            next_pos = pos + header_size + data[pos + header_size - 1]
+            if next_pos > end:
+                break
+            pos = next_pos
+        return pos
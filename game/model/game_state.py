@@ -1,7 +1,7 @@
 # model/game_state.py
 from config import GRID_SIZE
 from model.board import Board
-from rules.check_winner import check_winner
+from rules.check_winner import check_winner_at
 from rules.turns import next_player
 from logger_config import logger
 
@@ -16,48 +16,97 @@ class GameState:
         self.current_player = 1
         self.winner = None
         self.running = True
+        # move stack: cells played so far (row * board_size + col), X first
+        self.moves: list[int] = []
+        # cells taken back by undo(), last undone on top
+        self._redo: list[int] = []
 
     def apply_settings(self, board_size: int, win_length: int) -> None:
         """Apply new board settings and restart the game."""
         logger.debug(
-            f"GameState: applying settings board_size={board_size}, win_length={win_length}"
+            "GameState: applying settings board_size={}, win_length={}",
+            board_size,
+            win_length,
         )
         self.board_size = board_size
         self.win_length = win_length
         self.restart()
 
     def apply_move(self, row: int, col: int) -> None:
-        """Apply a single move for the current player."""
+        """Apply a single move for the current player (clears the redo history)."""
         if self.winner is not None:
             logger.debug("Move ignored: game already finished")
             return
 
         if not (0 <= row < self.board_size and 0 <= col < self.board_size):
-            logger.debug(f"Move ignored: out of range row={row}, col={col}")
+            logger.debug("Move ignored: out of range row={}, col={}", row, col)
             return
 
         if not self.board.is_empty(row, col):
-            logger.debug(f"Move ignored: cell not empty row={row}, col={col}")
+            logger.debug("Move ignored: cell not empty row={}, col={}", row, col)
             return
 
-        logger.debug(f"Move: player={self.current_player}, row={row}, col={col}")
-        self.board.set(row, col, self.current_player)
+        logger.debug("Move: player={}, row={}, col={}", self.current_player, row, col)
+        self._redo.clear()
+        self.make_move(row, col)
+
+        if self.winner == 1:
+            logger.info("Winner: X")
+        elif self.winner == -1:
+            logger.info("Winner: O")
+        elif self.winner == 0:
+            logger.info("Draw")
+
+    def make_move(self, row: int, col: int) -> None:
+        """Play an empty cell for the current player and push it on the move stack.
 
-        self.winner = check_winner(self.board.data, self.win_length)
+        No validation: the game must still be running and the cell empty.
+        """
+        self.board.set(row, col, self.current_player)
+        self.moves.append(row * self.board_size + col)
 
+        self.winner = check_winner_at(self.board, row, col, self.win_length)
         if self.winner is None:
             self.current_player = next_player(self.current_player)
-        else:
-            if self.winner == 1:
-                logger.info("Winner: X")
-            elif self.winner == -1:
-                logger.info("Winner: O")
-            else:
-                logger.info("Draw")
+
+    def unmake_move(self) -> int:
+        """Take back the last move in O(1); return its cell.
+
+        The cell is emptied (board hashes and counters follow), the player
+        who made the move is to move again and the game is running.
+        """
+        cell = self.moves.pop()
+        self.board.set(cell // self.board_size, cell % self.board_size, 0)
+        # X moves first, so the stack height says whose move it was
+        self.current_player = 1 if len(self.moves) % 2 == 0 else -1
+        self.winner = None
+        return cell
+
+    def undo(self) -> bool:
+        """Take back the last move, keeping it for redo(); False if none."""
+        if not self.moves:
+            return False
+        self._redo.append(self.unmake_move())
+        logger.debug("Move undone, {} left", len(self.moves))
+        return True
+
+    def redo(self) -> bool:
+        """Replay the last undone move; False if there is none."""
+        if not self._redo or self.winner is not None:
+            return False
+        row, col = divmod(self._redo.pop(), self.board_size)
+        self.make_move(row, col)
+        logger.debug("Move redone: row={}, col={}", row, col)
+        return True
 
     def restart(self) -> None:
         logger.debug("Game restarted")
-        self.board = Board(self.board_size)
+        if self.board.size == self.board_size:
+            self.board.reset()
+        else:
+            self.board = Board(self.board_size)
         self.current_player = 1
         self.winner = None
-        self.running = True
\ No newline at end of file
+        self.running = True
+        self.moves.clear()
+        self._redo.clear()
@@ -0,0 +1,123 @@
+# rules/batch.py
+# Vectorized engine for many games at once (requires numpy: the "batch" extra).
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+# result code of a game that has not finished yet (1 / -1 / 0 as in check_winner)
+IN_PROGRESS = 2
+
+
+def batch_check_winner(
+    boards: np.ndarray, win_length: int | None = None
+) -> np.ndarray:
+    """Batched equivalent of rules.check_winner.check_winner.
+
+    Args:
+        boards: array of shape (games, n, n) with values -1, 0, 1.
+        win_length: how many in a row are needed to win (default: n).
+
+    Returns:
+        int8 array of shape (games,): 1 / -1 for a winner, 0 for a draw,
+        IN_PROGRESS otherwise.
+    """
+    games, size, _ = boards.shape
+    k = win_length or size
+    full = (boards != 0).all(axis=(1, 2))
+
+    result = np.full(games, IN_PROGRESS, dtype=np.int8)
+    result[full] = 0
+    if k < 1 or k > size:
+        # no line fits on the board: nobody can win, a full board is a draw
+        return result
+
+    span = size - k + 1
+
+    # window sums over rows, columns, diagonals and anti-diagonals
+    rows = sliding_window_view(boards, k, axis=2).sum(axis=-1, dtype=np.int16)
+    cols = sliding_window_view(boards, k, axis=1).sum(axis=-1, dtype=np.int16)
+    diag = np.zeros((games, span, span), dtype=np.int16)
+    anti = np.zeros((games, span, span), dtype=np.int16)
+    for i in range(k):
+        diag += boards[:, i : i + span, i : i + span]
+        anti += boards[:, i : i + span, k - 1 - i : k - 1 - i + span]
+
+    sums = np.concatenate(
+        (
+            rows.reshape(games, -1),
+            cols.reshape(games, -1),
+            diag.reshape(games, -1),
+            anti.reshape(games, -1),
+        ),
+        axis=1,
+    )
+    x_wins = (sums == k).any(axis=1)
+    o_wins = (sums == -k).any(axis=1)
+    result[o_wins] = -1
+    result[x_wins] = 1
+    return result
+
+
+class BatchGames:
+    """Many games of one board configuration played in lockstep.
+
+    ``boards`` has shape (games, n, n). Every call to ``apply_moves`` plays
+    one move for the player to move in each unfinished game.
+    """
+
+    def __init__(
+        self,
+        games: int,
+        size: int,
+        win_length: int | None = None,
+        seed: int | None = None,
+    ):
+        self.size = size
+        self.win_length = win_length or size
+        self.rng = np.random.default_rng(seed)
+
+        cells = size * size
+        self.boards = np.zeros((games, size, size), dtype=np.int8)
+        self.current = np.ones(games, dtype=np.int8)
+        self.results = np.full(games, IN_PROGRESS, dtype=np.int8)
+        self.move_count = np.zeros(games, dtype=np.int16)
+        # flat cell index of every move in order, -1 for moves not played
+        self.moves = np.full((games, cells), -1, dtype=np.int16)
+
+    @property
+    def active(self) -> np.ndarray:
+        return self.results == IN_PROGRESS
+
+    def random_moves(self) -> np.ndarray:
+        """Pick a uniformly random empty cell (flat index) in every game."""
+        games = self.boards.shape[0]
+        noise = self.rng.random((games, self.size * self.size))
+        noise[self.boards.reshape(games, -1) != 0] = -1.0
+        return noise.argmax(axis=1)
+
+    def apply_moves(self, cells: np.ndarray) -> None:
+        """Play flat cell indexes, one per game; finished games are skipped.
+
+        Raises ValueError if a move targets an occupied cell.
+        """
+        games = np.flatnonzero(self.active)
+        if games.size == 0:
+            return
+
+        cells = np.asarray(cells)[games]
+        rows, cols = np.divmod(cells, self.size)
+        if (self.boards[games, rows, cols] != 0).any():
+            raise ValueError("Batch move on an occupied cell")
+
+        self.boards[games, rows, cols] = self.current[games]
+        self.moves[games, self.move_count[games]] = cells
+        self.move_count[games] += 1
+
+        self.results[games] = batch_check_winner(self.boards[games], self.win_length)
+        still_running = games[self.results[games] == IN_PROGRESS]
+        self.current[still_running] *= -1
+
+    def play_random(self) -> np.ndarray:
+        """Finish every game with random moves; return the results."""
+        while self.active.any():
+            self.apply_moves(self.random_moves())
+        return self.results
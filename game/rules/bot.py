@@ -1,17 +1,99 @@
 # rules/bot.py
 import random
 
+from config import BOT_TIME_BUDGET_MS
 
-def bot_move(board, player):
-    empty = []
-    size = len(board.data)
 
-    for r in range(size):
-        for c in range(size):
-            if board.data[r][c] == 0:
-                empty.append((r, c))
+class Bot:
+    """Base class for bot engines.
+
+    Engines receive a Board, the player to move (1 = X, -1 = O) and the win
+    length, and return a (row, col) move or None if there is no legal move.
+    Long-running engines poll ``should_stop()`` and return early when it
+    becomes true (the result is then discarded by the caller).
+    """
+
+    name = "base"
+
+    def __init__(self, seed: int | None = None):
+        self.rng = random.Random(seed)
+
+    def choose_move(self, board, player: int, win_length: int, should_stop=None):
+        raise NotImplementedError
+
+    def close(self) -> None:
+        """Release engine resources (worker processes, tables)."""
+
+
+class RandomBot(Bot):
+    """Plays a uniformly random empty cell."""
+
+    name = "random"
+
+    def choose_move(self, board, player: int, win_length: int, should_stop=None):
+        empty = board.empty_cells()
+        if not empty:
+            return None
+        return self.rng.choice(empty)
+
+
+def make_bot(name: str, **kwargs) -> Bot:
+    """Create a bot engine by name.
+
+    Engines: "random", "negamax", "iterative", "mcts", "solver".
+    """
+    # local imports keep engines optional and avoid import cycles
+    if name == "random":
+        return RandomBot(**kwargs)
+    if name == "negamax":
+        from rules.negamax import NegamaxBot
+
+        return NegamaxBot(**kwargs)
+    if name == "iterative":
+        from rules.negamax import NegamaxBot
+
+        kwargs.setdefault("time_budget_ms", BOT_TIME_BUDGET_MS)
+        return NegamaxBot(**kwargs)
+    if name == "mcts":
+        from rules.mcts import MCTSBot
+
+        return MCTSBot(**kwargs)
+    if name == "solver":
+        from rules.solver import SolverBot
+
+        return SolverBot(**kwargs)
+    raise ValueError(f"Unknown bot engine: {name}")
+
+
+def _parse_value(text: str):
+    for cast in (int, float):
+        try:
+            return cast(text)
+        except ValueError:
+            pass
+    return text
+
+
+def bot_from_spec(spec: str, **defaults) -> Bot:
+    """Create a bot from "name" or "name:key=value,key=value".
+
+    Example: "mcts:workers=4,iterations=2000". Keyword arguments act as
+    defaults that the spec can override.
+    """
+    name, _, options = spec.partition(":")
+    kwargs = dict(defaults)
+    for item in filter(None, options.split(",")):
+        key, sep, value = item.partition("=")
+        if not sep:
+            raise ValueError(f"Bad bot option '{item}' in '{spec}'")
+        kwargs[key.strip()] = _parse_value(value.strip())
+    return make_bot(name.strip(), **kwargs)
+
+
+def bot_move(board, player):
+    empty = board.empty_cells()
 
     if not empty:
         return None
 
-    return random.choice(empty)
\ No newline at end of file
+    return random.choice(empty)
@@ -1,30 +1,7 @@
 # rules/check_winner.py
-from typing import Optional, Sequence
+from typing import Optional
 
-
-def _check_line(line: Sequence[int], win_length: int) -> int | None:
-    """Check a single 1D line for a winner with given win length.
-
-    Returns:
-        1  if player X wins
-        -1 if player O wins
-        None if no winner in this line
-    """
-    size = len(line)
-    if win_length > size:
-        return None
-
-    start = 0
-    while start <= size - win_length:
-        segment = line[start : start + win_length]
-        s = sum(segment)
-        if s == win_length:
-            return 1
-        if s == -win_length:
-            return -1
-        start += 1
-
-    return None
+from rules.lines import line_index
 
 
 def check_winner(board, win_length: int | None = None) -> Optional[int]:
@@ -49,48 +26,67 @@ def check_winner(board, win_length: int | None = None) -> Optional[int]:
     if target < 1:
         return None
 
-    # horizontal
+    x_mask = 0
+    o_mask = 0
+    has_empty = False
+    bit = 1
     for row in board:
-        res = _check_line(row, target)
-        if res is not None:
-            return res
-
-    # vertical
-    for col in range(size):
-        column = [board[row][col] for row in range(size)]
-        res = _check_line(column, target)
-        if res is not None:
-            return res
-
-    # main diagonals (top-left to bottom-right)
-    for start_row in range(size - target + 1):
-        diag = [board[start_row + k][k] for k in range(size - start_row)]
-        res = _check_line(diag, target)
-        if res is not None:
-            return res
-
-    for start_col in range(1, size - target + 1):
-        diag = [board[k][start_col + k] for k in range(size - start_col)]
-        res = _check_line(diag, target)
-        if res is not None:
-            return res
-
-    # anti-diagonals (top-right to bottom-left)
-    for start_row in range(size - target + 1):
-        diag = [board[start_row + k][size - 1 - k] for k in range(size - start_row)]
-        res = _check_line(diag, target)
-        if res is not None:
-            return res
-
-    for start_col in range(size - 2, target - 2, -1):
-        diag = [board[k][start_col - k] for k in range(start_col + 1)]
-        res = _check_line(diag, target)
-        if res is not None:
-            return res
+        for cell in row:
+            if cell == 1:
+                x_mask |= bit
+            elif cell == -1:
+                o_mask |= bit
+            else:
+                has_empty = True
+            bit <<= 1
+
+    # X is checked before O, so X is reported when both players
+    # somehow have a full line; no line fits when target > size
+    if target <= size:
+        index = line_index(size, target)
+        for player, mask in ((1, x_mask), (-1, o_mask)):
+            for seg_mask in index.masks:
+                if mask & seg_mask == seg_mask:
+                    return player
 
     # draw?
-    for row in board:
-        if 0 in row:
-            return None
+    if has_empty:
+        return None
+
+    return 0
+
 
-    return 0
\ No newline at end of file
+def check_winner_at(
+    board, row: int, col: int, win_length: int | None = None
+) -> Optional[int]:
+    """Check the result right after a move at (row, col).
+
+    Only the winning segments through the played cell are tested, so the
+    cost is O(win_length) instead of a full board pass. Draws are detected
+    with the board's empty-cell counter.
+
+    Args:
+        board: Board instance (bitmask representation).
+        row, col: cell that has just been played.
+        win_length: how many in a row are needed to win.
+            If None, uses full board size (classic tic-tac-toe).
+
+    Returns:
+        1   if player X wins
+        -1  if player O wins
+        0   if draw
+        None if game is still in progress
+    """
+    size = board.size
+    target = win_length or size
+
+    player = board.get(row, col)
+    if player != 0 and 1 <= target <= size:
+        mask = board.x_mask if player == 1 else board.o_mask
+        if line_index(size, target).is_win_at(mask, row * size + col):
+            return player
+
+    if board.empty_count == 0:
+        return 0
+
+    return None
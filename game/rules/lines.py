@@ -0,0 +1,87 @@
+# rules/lines.py
+from functools import lru_cache
+
+# how many (board_size, win_length) indexes are kept in memory
+LINE_INDEX_CACHE_SIZE = 32
+
+_DIRECTIONS = ((0, 1), (1, 0), (1, 1), (1, -1))
+
+
+class LineIndex:
+    """All winning segments of a square board for a given win length.
+
+    Cells are flat indexes ``row * size + col``.
+
+    Attributes:
+        segments: tuple of cell-index tuples, one per winning segment.
+        masks: bitmask of every segment (same order as ``segments``).
+        cell_segments: for each cell, ids of the segments passing through it.
+        cell_masks: for each cell, masks of the segments passing through it.
+    """
+
+    __slots__ = (
+        "size",
+        "win_length",
+        "segments",
+        "masks",
+        "cell_segments",
+        "cell_masks",
+    )
+
+    def __init__(self, size: int, win_length: int):
+        self.size = size
+        self.win_length = win_length
+
+        segments = []
+        for row in range(size):
+            for col in range(size):
+                for dr, dc in _DIRECTIONS:
+                    end_row = row + dr * (win_length - 1)
+                    end_col = col + dc * (win_length - 1)
+                    if not (0 <= end_row < size and 0 <= end_col < size):
+                        continue
+                    segments.append(
+                        tuple(
+                            (row + dr * k) * size + (col + dc * k)
+                            for k in range(win_length)
+                        )
+                    )
+
+        masks = []
+        for segment in segments:
+            mask = 0
+            for cell in segment:
+                mask |= 1 << cell
+            masks.append(mask)
+
+        by_cell: list[list[int]] = [[] for _ in range(size * size)]
+        for seg_id, segment in enumerate(segments):
+            for cell in segment:
+                by_cell[cell].append(seg_id)
+
+        self.segments = tuple(segments)
+        self.masks = tuple(masks)
+        self.cell_segments = tuple(tuple(ids) for ids in by_cell)
+        self.cell_masks = tuple(
+            tuple(masks[seg_id] for seg_id in ids) for ids in by_cell
+        )
+
+    def is_win(self, mask: int) -> bool:
+        """Return True if mask fully covers any winning segment."""
+        for seg_mask in self.masks:
+            if mask & seg_mask == seg_mask:
+                return True
+        return False
+
+    def is_win_at(self, mask: int, cell: int) -> bool:
+        """Return True if mask covers a winning segment through cell."""
+        for seg_mask in self.cell_masks[cell]:
+            if mask & seg_mask == seg_mask:
+                return True
+        return False
+
+
+@lru_cache(maxsize=LINE_INDEX_CACHE_SIZE)
+def line_index(size: int, win_length: int) -> LineIndex:
+    """Return the shared (cached) LineIndex for a board configuration."""
+    return LineIndex(size, win_length)
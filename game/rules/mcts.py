@@ -0,0 +1,280 @@
+# rules/mcts.py
+import math
+import multiprocessing
+import os
+import random
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+
+from rules.bot import Bot
+from rules.lines import line_index
+
+DEFAULT_ITERATIONS = 4000
+UCT_EXPLORATION = 1.4
+
+# how often (in iterations) a worker checks its time budget
+_TIME_CHECK_ITERATIONS = 64
+
+# set in pool workers: the pool's shared stop flag
+_worker_stop = None
+
+
+class _Node:
+    """Search tree node; ``wins`` are counted for the player who made ``move``."""
+
+    __slots__ = ("move", "parent", "children", "untried", "visits", "wins", "result")
+
+    def __init__(self, move: int, parent, untried: list[int], result: int | None):
+        self.move = move
+        self.parent = parent
+        self.children: list[_Node] = []
+        self.untried = untried
+        self.visits = 0
+        self.wins = 0.0
+        # 1 if the move won, 0 if it filled the board, None otherwise
+        self.result = result
+
+
+def _cells(mask: int) -> list[int]:
+    cells = []
+    while mask:
+        low = mask & -mask
+        cells.append(low.bit_length() - 1)
+        mask ^= low
+    return cells
+
+
+def _is_win_at(mask: int, cell: int, cell_masks) -> bool:
+    for seg_mask in cell_masks[cell]:
+        if mask & seg_mask == seg_mask:
+            return True
+    return False
+
+
+def _playout(me: int, opp: int, free: list[int], cell_masks, rng) -> int:
+    """Play random moves to the end; return 1/0/-1 for the side to move (me)."""
+    order = free[:]
+    rng.shuffle(order)
+    sign = 1
+    for cell in order:
+        me |= 1 << cell
+        if _is_win_at(me, cell, cell_masks):
+            return sign
+        me, opp = opp, me
+        sign = -sign
+    return 0
+
+
+def uct_search(
+    me: int,
+    opp: int,
+    size: int,
+    win_length: int,
+    iterations: int,
+    budget_s: float | None = None,
+    seed: int | None = None,
+    should_stop=None,
+) -> dict[int, tuple[int, float]]:
+    """Run UCT from a position; return {cell: (visits, wins)} for root moves.
+
+    ``me`` is the side to move. Module-level so it can run in worker processes
+    (there ``should_stop`` polls the pool's stop flag). Stopping early can
+    leave the result empty.
+    """
+    rng = random.Random(seed)
+    cell_masks = line_index(size, win_length).cell_masks
+    full = (1 << (size * size)) - 1
+    deadline = time.perf_counter() + budget_s if budget_s is not None else None
+
+    root = _Node(-1, None, _cells(full & ~(me | opp)), None)
+    log = math.log
+    sqrt = math.sqrt
+
+    for i in range(iterations):
+        if not i % _TIME_CHECK_ITERATIONS and (
+            (deadline is not None and time.perf_counter() > deadline)
+            or (should_stop is not None and should_stop())
+        ):
+            break
+
+        node = root
+        a, b = me, opp  # a is the side to move at node
+
+        # selection
+        while not node.untried and node.children and node.result is None:
+            log_n = log(node.visits)
+            best = None
+            best_score = -1.0
+            for child in node.children:
+                score = child.wins / child.visits + UCT_EXPLORATION * sqrt(
+                    log_n / child.visits
+                )
+                if score > best_score:
+                    best_score = score
+                    best = child
+            node = best
+            a, b = b, a | (1 << node.move)
+
+        # expansion
+        if node.result is None and node.untried:
+            cell = node.untried.pop(rng.randrange(len(node.untried)))
+            a |= 1 << cell
+            if _is_win_at(a, cell, cell_masks):
+                result = 1
+            elif (a | b) == full:
+                result = 0
+            else:
+                result = None
+            free = [] if result is not None else _cells(full & ~(a | b))
+            child = _Node(cell, node, free, result)
+            node.children.append(child)
+            node = child
+            a, b = b, a
+
+        # simulation, scored for the player who made node.move
+        if node.result is not None:
+            outcome = node.result
+        else:
+            outcome = -_playout(a, b, node.untried, cell_masks, rng)
+
+        # backpropagation
+        while node is not None:
+            node.visits += 1
+            node.wins += (outcome + 1) / 2
+            outcome = -outcome
+            node = node.parent
+
+    return {child.move: (child.visits, child.wins) for child in root.children}
+
+
+def _init_worker(stop_event) -> None:
+    global _worker_stop
+    _worker_stop = stop_event
+
+
+def _worker_search(*args) -> dict[int, tuple[int, float]]:
+    """uct_search in a pool worker, stopping when the pool's flag is set."""
+    return uct_search(*args, should_stop=_worker_stop.is_set)
+
+
+class MCTSBot(Bot):
+    """Monte Carlo Tree Search bot (UCT with random playouts).
+
+    With ``workers`` > 1 the search uses root parallelization: every worker
+    process grows its own tree from the current position with a different
+    seed, and root visit counts are summed to choose the move.
+    """
+
+    name = "mcts"
+
+    def __init__(
+        self,
+        iterations: int = DEFAULT_ITERATIONS,
+        workers: int | None = None,
+        time_budget_ms: int | None = None,
+        seed: int | None = None,
+    ):
+        super().__init__(seed)
+        self.iterations = iterations
+        self.workers = workers or os.cpu_count() or 1
+        self.time_budget_ms = time_budget_ms
+        self._pool: ProcessPoolExecutor | None = None
+        self._stop_event = None
+
+    def close(self) -> None:
+        if self._pool is not None:
+            self._stop_event.set()
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+    def choose_move(self, board, player: int, win_length: int, should_stop=None):
+        size = board.size
+        if board.empty_count == 0:
+            return None
+
+        win_length = win_length or size
+        if player == 1:
+            me, opp = board.x_mask, board.o_mask
+        else:
+            me, opp = board.o_mask, board.x_mask
+
+        forced = self._forced_move(me, opp, size, win_length)
+        if forced is not None:
+            return divmod(forced, size)
+
+        budget_s = None
+        if self.time_budget_ms is not None:
+            budget_s = self.time_budget_ms / 1000.0
+
+        if self.workers <= 1:
+            stats = uct_search(
+                me, opp, size, win_length, self.iterations, budget_s,
+                self.rng.getrandbits(32), should_stop,
+            )
+        else:
+            stats = self._parallel_search(
+                me, opp, size, win_length, budget_s, should_stop
+            )
+            if stats is None:
+                return board.empty_cells()[0]  # stopped, result is discarded
+
+        if not stats:
+            # stopped or out of time before the first iteration
+            return board.empty_cells()[0]
+        move = max(stats, key=lambda cell: stats[cell][0])
+        return divmod(move, size)
+
+    def _parallel_search(self, me, opp, size, win_length, budget_s, should_stop):
+        if self._pool is None:
+            # handed to the workers when they start: a multiprocessing
+            # Event cannot be passed along with each task
+            self._stop_event = multiprocessing.Event()
+            self._pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self._stop_event,),
+            )
+        self._stop_event.clear()
+
+        per_worker = -(-self.iterations // self.workers)
+        futures = [
+            self._pool.submit(
+                _worker_search, me, opp, size, win_length, per_worker, budget_s,
+                self.rng.getrandbits(32),
+            )
+            for _ in range(self.workers)
+        ]
+
+        pending = set(futures)
+        while pending:
+            if should_stop is not None and should_stop():
+                # running searches see the flag within _TIME_CHECK_ITERATIONS
+                # iterations; wait for them so the next search starts on
+                # idle workers with the flag cleared
+                self._stop_event.set()
+                for future in pending:
+                    future.cancel()
+                wait(pending)
+                return None
+            _, pending = wait(pending, timeout=0.05, return_when=FIRST_COMPLETED)
+
+        stats: dict[int, list] = {}
+        for future in futures:
+            for cell, (visits, wins) in future.result().items():
+                total = stats.setdefault(cell, [0, 0.0])
+                total[0] += visits
+                total[1] += wins
+        return stats
+
+    @staticmethod
+    def _forced_move(me: int, opp: int, size: int, win_length: int) -> int | None:
+        """Return a winning move, else a move blocking an immediate loss."""
+        cell_masks = line_index(size, win_length).cell_masks
+        free = _cells(((1 << (size * size)) - 1) & ~(me | opp))
+        for cell in free:
+            if _is_win_at(me | (1 << cell), cell, cell_masks):
+                return cell
+        for cell in free:
+            if _is_win_at(opp | (1 << cell), cell, cell_masks):
+                return cell
+        return None
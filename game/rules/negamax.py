@@ -0,0 +1,435 @@
+# rules/negamax.py
+import time
+
+from rules.bot import Bot
+from rules.lines import line_index
+from rules.symmetry import symmetric_hashes, symmetry_tables
+from rules.transposition import (
+    DEFAULT_TT_SIZE,
+    EXACT,
+    LOWER_BOUND,
+    UPPER_BOUND,
+    TranspositionTable,
+)
+
+# scores are from the point of view of the side to move;
+# a win is worth WIN_SCORE minus the number of stones on the board,
+# so faster wins (and slower losses) are preferred
+WIN_SCORE = 1_000_000_000
+INF = WIN_SCORE * 2
+
+# boards with more cells than this only consider moves next to existing stones
+FULL_WIDTH_CELLS = 25
+
+
+def default_depth(size: int, empty_count: int) -> int:
+    """Search depth that keeps a single move well under a second."""
+    if size <= 3:
+        return empty_count
+    if size == 4:
+        return min(empty_count, 7)
+    if size == 5:
+        return min(empty_count, 4)
+    return min(empty_count, 3)
+
+
+# how often (in nodes) the deadline and stop callback are checked
+_TIME_CHECK_NODES = 128
+
+
+class _SearchTimeout(Exception):
+    """Raised inside the search when time is up or a stop was requested."""
+
+
+class NegamaxBot(Bot):
+    """Negamax search with alpha-beta pruning and a transposition table.
+
+    Positions are kept as two bitmasks (side to move, opponent); moves are
+    ordered by principal variation, transposition-table move, immediate wins
+    and forced blocks, then history heuristic and static cell weight.
+
+    The transposition table is keyed by the canonical (symmetry-reduced)
+    Zobrist hash, so rotated and mirrored positions share one entry; stored
+    moves are kept in the canonical frame. Moves that are symmetric copies of
+    each other in a symmetric position are searched only once.
+
+    With ``time_budget_ms`` set the bot runs iterative deepening: depth 1, 2,
+    ... until the budget runs out, returning the best move found so far.
+    """
+
+    name = "negamax"
+
+    def __init__(
+        self,
+        max_depth: int | None = None,
+        tt_size: int = DEFAULT_TT_SIZE,
+        time_budget_ms: int | None = None,
+        seed: int | None = None,
+    ):
+        super().__init__(seed)
+        self.max_depth = max_depth
+        self.time_budget_ms = time_budget_ms
+        self.tt = TranspositionTable(tt_size)
+        self.nodes = 0
+        self.completed_depth = 0
+        self._config: tuple[int, int] | None = None
+        self._deadline: float | None = None
+        self._should_stop = None
+        self._pv_moves: dict[int, int] = {}
+        self._root_best = -1
+
+    def _prepare(self, size: int, win_length: int) -> None:
+        """Rebuild per-configuration tables when board settings change."""
+        if self._config == (size, win_length):
+            return
+        self._config = (size, win_length)
+
+        index = line_index(size, win_length)
+        cells = size * size
+
+        self._size = size
+        self._full = (1 << cells) - 1
+        self._masks = index.masks
+        self._cell_masks = index.cell_masks
+        tables = symmetry_tables(size)
+        self._sym_keys = (tables.x_keys, tables.o_keys)
+        self._perms = tables.perms
+        self._inverse = tables.inverse
+        self._static = tuple(len(seg) for seg in index.cell_segments)
+        self._history = [0] * cells
+        self._weights = tuple(
+            0 if n == 0 else 4 ** (n - 1) for n in range(win_length + 1)
+        )
+
+        near = []
+        for cell in range(cells):
+            row, col = divmod(cell, size)
+            mask = 0
+            for r in range(max(row - 1, 0), min(row + 2, size)):
+                for c in range(max(col - 1, 0), min(col + 2, size)):
+                    mask |= 1 << (r * size + c)
+            near.append(mask)
+        self._near = tuple(near) if cells > FULL_WIDTH_CELLS else None
+
+        center = size // 2
+        self._center = center * size + center
+
+        self.tt.clear()
+
+    def choose_move(self, board, player: int, win_length: int, should_stop=None):
+        size = board.size
+        if board.empty_count == 0:
+            return None
+
+        self._prepare(size, win_length or size)
+        self._should_stop = should_stop
+        try:
+            if self.time_budget_ms is not None:
+                move = self._search_timed(board, player, self.time_budget_ms)
+            else:
+                depth = self.max_depth or default_depth(size, board.empty_count)
+                move = self._search(board, player, depth)
+        finally:
+            self._should_stop = None
+            self._deadline = None
+        return divmod(move, size)
+
+    def _start(self, board, player: int):
+        """Reset per-search state; return (me, opp, hashes, side) for the root."""
+        if player == 1:
+            me, opp, side = board.x_mask, board.o_mask, 0
+        else:
+            me, opp, side = board.o_mask, board.x_mask, 1
+        cells = board.size * board.size
+        hashes = getattr(board, "hashes", None)
+        if hashes is None:
+            hashes = symmetric_hashes(board.x_mask, board.o_mask, board.size)
+
+        self.tt.new_search()
+        self._history = [0] * cells
+        self._pv_moves = {}
+        self._deadline = None
+        self.nodes = 0
+        self.completed_depth = 0
+        return me, opp, hashes, side
+
+    def _search(self, board, player: int, depth: int) -> int:
+        """Search the root position to a fixed depth and return a cell index."""
+        me, opp, hashes, side = self._start(board, player)
+        try:
+            _, move = self._root(me, opp, depth, hashes, side)
+        except _SearchTimeout:
+            # stopped from outside: any legal move will do, it is discarded
+            return self._ordered_moves(me, opp, -1, hashes)[0]
+        self.completed_depth = depth
+        return move
+
+    def _search_timed(self, board, player: int, budget_ms: int) -> int:
+        """Iterative deepening within budget_ms; return a cell index."""
+        me, opp, hashes, side = self._start(board, player)
+        self._deadline = time.perf_counter() + budget_ms / 1000.0
+
+        max_depth = board.empty_count
+        if self.max_depth is not None:
+            max_depth = min(max_depth, self.max_depth)
+
+        # a legal fallback in case not even depth 1 finishes
+        best_move = self._ordered_moves(me, opp, -1, hashes)[0]
+        for depth in range(1, max_depth + 1):
+            self._root_best = -1
+            try:
+                score, move = self._root(me, opp, depth, hashes, side)
+            except _SearchTimeout:
+                # root moves are tried PV-first and the best one is only
+                # replaced by a strictly better score, so a partial
+                # iteration is at least as good as the previous one
+                if self._root_best >= 0:
+                    best_move = self._root_best
+                break
+
+            best_move = move
+            self.completed_depth = depth
+            if abs(score) >= WIN_SCORE - board.size * board.size:
+                break  # forced result found, deeper search changes nothing
+            self._pv_moves = self._principal_variation(me, opp, hashes, side, depth)
+
+        return best_move
+
+    def _principal_variation(
+        self, me: int, opp: int, hashes: tuple, side: int, depth: int
+    ) -> dict[int, int]:
+        """Follow best moves stored in the TT.
+
+        Returns {canonical key: move in the canonical frame}.
+        """
+        pv: dict[int, int] = {}
+        for _ in range(depth):
+            key = min(hashes)
+            entry = self.tt.probe(key)
+            if entry is None or key in pv or entry[4] < 0:
+                break
+            move = self._inverse[hashes.index(key)][entry[4]]
+            bit = 1 << move
+            if (me | opp) & bit:
+                break
+            pv[key] = entry[4]
+            me |= bit
+            if self._is_win_at(me, move):
+                break
+            hashes = self._child_hashes(hashes, side, move)
+            me, opp, side = opp, me, side ^ 1
+        return pv
+
+    def _child_hashes(self, hashes: tuple, side: int, cell: int) -> tuple:
+        return tuple(h ^ k for h, k in zip(hashes, self._sym_keys[side][cell]))
+
+    def _lookup(self, hashes: tuple):
+        """Return (key, sym, entry, move) for a position.
+
+        ``move`` is the TT/PV move mapped back to this position's frame, or -1.
+        """
+        key = min(hashes)
+        sym = hashes.index(key)
+        entry = self.tt.probe(key)
+        stored = entry[4] if entry is not None else -1
+        stored = self._pv_moves.get(key, stored)
+        move = self._inverse[sym][stored] if stored >= 0 else -1
+        return key, sym, entry, move
+
+    def _store(self, key, sym, depth, value, flag, move) -> None:
+        stored = self._perms[sym][move] if move >= 0 else -1
+        self.tt.store(key, depth, value, flag, stored)
+
+    def _root(self, me: int, opp: int, depth: int, hashes: tuple, side: int):
+        key, sym, _, tt_move = self._lookup(hashes)
+
+        moves = self._ordered_moves(me, opp, tt_move, hashes, shuffle=True)
+        alpha = -INF
+        best_move = moves[0]
+        stones = (me | opp).bit_count() + 1
+        free = self._full & ~(me | opp)
+
+        for cell in moves:
+            bit = 1 << cell
+            new_me = me | bit
+            if self._is_win_at(new_me, cell):
+                value = WIN_SCORE - stones
+            elif not free ^ bit:
+                value = 0
+            else:
+                value = -self._negamax(
+                    opp,
+                    new_me,
+                    depth - 1,
+                    -INF,
+                    -alpha,
+                    self._child_hashes(hashes, side, cell),
+                    side ^ 1,
+                )
+            if value > alpha:
+                alpha = value
+                best_move = cell
+                self._root_best = cell
+
+        self._store(key, sym, depth, alpha, EXACT, best_move)
+        return alpha, best_move
+
+    def _negamax(
+        self,
+        me: int,
+        opp: int,
+        depth: int,
+        alpha: int,
+        beta: int,
+        hashes: tuple,
+        side: int,
+    ) -> int:
+        self.nodes += 1
+        if not self.nodes % _TIME_CHECK_NODES and (
+            (self._deadline is not None and time.perf_counter() > self._deadline)
+            or (self._should_stop is not None and self._should_stop())
+        ):
+            raise _SearchTimeout()
+        alpha_orig = alpha
+
+        key, sym, entry, tt_move = self._lookup(hashes)
+        if entry is not None:
+            _, e_depth, e_value, e_flag, _, _ = entry
+            if e_depth >= depth:
+                if e_flag == EXACT:
+                    return e_value
+                if e_flag == LOWER_BOUND:
+                    alpha = max(alpha, e_value)
+                else:
+                    beta = min(beta, e_value)
+                if alpha >= beta:
+                    return e_value
+
+        if depth <= 0:
+            return self._evaluate(me, opp)
+
+        occupied = me | opp
+        free = self._full & ~occupied
+        stones = occupied.bit_count() + 1
+        sym_keys = self._sym_keys[side]
+        history = self._history
+
+        best = -INF
+        best_move = -1
+        for cell in self._ordered_moves(me, opp, tt_move, hashes):
+            bit = 1 << cell
+            new_me = me | bit
+            if self._is_win_at(new_me, cell):
+                value = WIN_SCORE - stones
+            elif not free ^ bit:
+                value = 0
+            else:
+                child = tuple(h ^ k for h, k in zip(hashes, sym_keys[cell]))
+                value = -self._negamax(
+                    opp, new_me, depth - 1, -beta, -alpha, child, side ^ 1
+                )
+            if value > best:
+                best = value
+                best_move = cell
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        history[cell] += depth * depth
+                        break
+
+        if best <= alpha_orig:
+            flag = UPPER_BOUND
+        elif best >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self._store(key, sym, depth, best, flag, best_move)
+        return best
+
+    def _is_win_at(self, mask: int, cell: int) -> bool:
+        for seg_mask in self._cell_masks[cell]:
+            if mask & seg_mask == seg_mask:
+                return True
+        return False
+
+    def _candidates(self, me: int, opp: int) -> list[int]:
+        occupied = me | opp
+        free = self._full & ~occupied
+        if self._near is not None:
+            if not occupied:
+                return [self._center]
+            area = 0
+            mask = occupied
+            near = self._near
+            while mask:
+                low = mask & -mask
+                area |= near[low.bit_length() - 1]
+                mask ^= low
+            if free & area:
+                free &= area
+
+        cells = []
+        while free:
+            low = free & -free
+            cells.append(low.bit_length() - 1)
+            free ^= low
+        return cells
+
+    def _ordered_moves(
+        self, me: int, opp: int, tt_move: int, hashes: tuple, shuffle: bool = False
+    ) -> list[int]:
+        """Return candidate moves, best guesses first.
+
+        An immediate win is returned alone; if the opponent threatens to win,
+        only the blocking cells are returned.
+        """
+        cells = self._candidates(me, opp)
+
+        # symmetries that leave the position unchanged make some moves
+        # equivalent; keep one cell of each group
+        base = hashes[0]
+        stabilizer = [perm for perm, h in zip(self._perms, hashes) if h == base]
+        if len(stabilizer) > 1:
+            seen: set[int] = set()
+            unique = []
+            for cell in cells:
+                if cell not in seen:
+                    unique.append(cell)
+                    seen.update(perm[cell] for perm in stabilizer)
+            cells = unique
+
+        if shuffle:
+            self.rng.shuffle(cells)
+
+        is_win_at = self._is_win_at
+        blocks = []
+        for cell in cells:
+            bit = 1 << cell
+            if is_win_at(me | bit, cell):
+                return [cell]
+            if is_win_at(opp | bit, cell):
+                blocks.append(cell)
+        if blocks:
+            return blocks
+
+        history = self._history
+        static = self._static
+        cells.sort(key=lambda c: history[c] * 64 + static[c], reverse=True)
+        if tt_move >= 0 and tt_move in cells:
+            cells.remove(tt_move)
+            cells.insert(0, tt_move)
+        return cells
+
+    def _evaluate(self, me: int, opp: int) -> int:
+        """Static score: open segments weighted by how filled they are."""
+        weights = self._weights
+        score = 0
+        for seg_mask in self._masks:
+            mine = me & seg_mask
+            theirs = opp & seg_mask
+            if mine:
+                if not theirs:
+                    score += weights[mine.bit_count()]
+            elif theirs:
+                score -= weights[theirs.bit_count()]
+        return score
@@ -0,0 +1,300 @@
+# rules/solver.py
+# Perfect-play solver and precomputed tables for small boards.
+#
+# A table holds one byte per position, indexed by the base-3 number of the
+# board (digit 1 = X, 2 = O, cell i has weight 3**i). Every reachable
+# position with the game still running stores its value for the side to
+# move and the best move (fastest win / slowest loss).
+#
+# Build tables once (from the game directory):
+#     python -m rules.solver
+#     python -m rules.solver --size 4 --win 3
+#
+# Tables are written next to this module, or to USER_TABLE_DIR when the
+# package directory is read-only (GAME_TABLE_DIR overrides both).
+import argparse
+import mmap
+import os
+import sys
+import time
+from pathlib import Path
+
+from logger_config import logger
+from rules.bot import Bot, make_bot
+from rules.lines import line_index
+
+TABLE_DIR = Path(__file__).with_name("tables")
+USER_TABLE_DIR = (
+    Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    / "tic-tac-toe"
+    / "tables"
+)
+
+# board sizes the solver supports; 4x4 tables are 43 MB each
+SOLVER_SIZES = (3, 4)
+MIN_WIN_LENGTH = 3
+
+# tables this small are built on first use instead of failing over
+AUTO_BUILD_MAX_CELLS = 9
+
+_MAGIC = b"TTT1"
+_HEADER_SIZE = 8
+
+# entry byte: 0x80 | (value + 1) << 5 | move; 0 = not a stored position
+_SOLVED = 0x80
+_NO_MOVE = 31
+
+
+def _table_dirs() -> list[Path]:
+    """Table directories in search order; new tables go to the first writable one."""
+    override = os.environ.get("GAME_TABLE_DIR")
+    if override:
+        return [Path(override)]
+    return [TABLE_DIR, USER_TABLE_DIR]
+
+
+def table_path(size: int, win_length: int) -> Path:
+    """Path of an existing table, else where a new one would be written first."""
+    name = f"solved_{size}x{size}_k{win_length}.bin"
+    dirs = _table_dirs()
+    for directory in dirs:
+        if (directory / name).exists():
+            return directory / name
+    return dirs[0] / name
+
+
+def _base3_tables(cells: int) -> list[list[int]]:
+    """Per-byte lookup tables: chunk -> byte value -> sum of 3**cell."""
+    tables = []
+    for chunk in range(0, cells, 8):
+        table = []
+        for byte in range(256):
+            total = 0
+            for bit in range(8):
+                if byte >> bit & 1 and chunk + bit < cells:
+                    total += 3 ** (chunk + bit)
+            table.append(total)
+        tables.append(table)
+    return tables
+
+
+def _position_index(x_mask: int, o_mask: int, tables: list[list[int]]) -> int:
+    index = 0
+    for table in tables:
+        index += table[x_mask & 0xFF] + 2 * table[o_mask & 0xFF]
+        x_mask >>= 8
+        o_mask >>= 8
+    return index
+
+
+def build_table(size: int, win_length: int) -> bytearray:
+    """Solve every position reachable from the empty board."""
+    cells = size * size
+    full = (1 << cells) - 1
+    cell_masks = line_index(size, win_length).cell_masks
+    pow3 = [3**cell for cell in range(cells)]
+
+    table = bytearray(3**cells)
+    # plies to the end of the game under best play; only needed while solving
+    distance = bytearray(3**cells)
+
+    def is_win_at(mask: int, cell: int) -> bool:
+        for seg_mask in cell_masks[cell]:
+            if mask & seg_mask == seg_mask:
+                return True
+        return False
+
+    def solve(me: int, opp: int, index: int, digit: int) -> tuple[int, int]:
+        entry = table[index]
+        if entry:
+            return (entry >> 5 & 3) - 1, distance[index]
+
+        free = full & ~(me | opp)
+        best_value = -2
+        best_dist = 0
+        best_move = _NO_MOVE
+        moves = free
+        while moves:
+            low = moves & -moves
+            moves ^= low
+            cell = low.bit_length() - 1
+            new_me = me | low
+            if is_win_at(new_me, cell):
+                value, dist = 1, 1
+            elif free == low:
+                value, dist = 0, 1  # last cell filled without a win
+            else:
+                child_value, child_dist = solve(
+                    opp, new_me, index + digit * pow3[cell], 3 - digit
+                )
+                value, dist = -child_value, child_dist + 1
+
+            if (
+                value > best_value
+                or (value == best_value == 1 and dist < best_dist)
+                or (value == best_value != 1 and dist > best_dist)
+            ):
+                best_value, best_dist, best_move = value, dist, cell
+
+        table[index] = _SOLVED | (best_value + 1) << 5 | best_move
+        distance[index] = best_dist
+        return best_value, best_dist
+
+    previous_limit = sys.getrecursionlimit()
+    sys.setrecursionlimit(max(previous_limit, cells * 4 + 100))
+    try:
+        solve(0, 0, 0, 1)
+    finally:
+        sys.setrecursionlimit(previous_limit)
+    return table
+
+
+def write_table(size: int, win_length: int) -> Path:
+    """Build a table and save it to the first writable table directory.
+
+    Raises OSError if no directory can be written.
+    """
+    started = time.perf_counter()
+    table = build_table(size, win_length)
+    name = table_path(size, win_length).name
+
+    error = None
+    for directory in _table_dirs():
+        path = directory / name
+        tmp_path = path.with_suffix(".tmp")
+        try:
+            directory.mkdir(parents=True, exist_ok=True)
+            with open(tmp_path, "wb") as fh:
+                fh.write(_MAGIC + bytes((size, win_length, 0, 0)))
+                fh.write(table)
+            tmp_path.replace(path)
+        except OSError as exc:
+            error = exc
+            continue
+
+        logger.info(
+            f"Solver: wrote {path} in {time.perf_counter() - started:.1f}s"
+        )
+        return path
+    raise error
+
+
+class EndgameTable:
+    """Read-only view of a solved table; the file is memory-mapped on first use."""
+
+    def __init__(self, size: int, win_length: int):
+        self.size = size
+        self.win_length = win_length
+        self.path = table_path(size, win_length)
+        self._data: mmap.mmap | None = None
+        self._index_tables = _base3_tables(size * size)
+
+    def available(self) -> bool:
+        return self._data is not None or self.path.exists()
+
+    def _load(self) -> mmap.mmap:
+        if self._data is None:
+            with open(self.path, "rb") as fh:
+                data = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+            header = data[:_HEADER_SIZE]
+            if header[:4] != _MAGIC or tuple(header[4:6]) != (
+                self.size,
+                self.win_length,
+            ):
+                data.close()
+                raise ValueError(f"Invalid endgame table: {self.path}")
+            self._data = data
+        return self._data
+
+    def lookup(self, x_mask: int, o_mask: int) -> tuple[int, int] | None:
+        """Return (value for side to move, best cell) or None if not stored."""
+        data = self._load()
+        index = _position_index(x_mask, o_mask, self._index_tables)
+        entry = data[_HEADER_SIZE + index]
+        if not entry & _SOLVED:
+            return None
+        return (entry >> 5 & 3) - 1, entry & 0x1F
+
+    def close(self) -> None:
+        if self._data is not None:
+            self._data.close()
+            self._data = None
+
+
+class SolverBot(Bot):
+    """Plays perfectly from precomputed tables; other boards use a fallback bot."""
+
+    name = "solver"
+
+    def __init__(self, fallback: str = "iterative", seed: int | None = None):
+        super().__init__(seed)
+        self.fallback_name = fallback
+        self._fallback: Bot | None = None
+        self._tables: dict[tuple[int, int], EndgameTable | None] = {}
+
+    def _table(self, size: int, win_length: int) -> EndgameTable | None:
+        key = (size, win_length)
+        if key not in self._tables:
+            table = None
+            if size in SOLVER_SIZES and MIN_WIN_LENGTH <= win_length <= size:
+                table = EndgameTable(size, win_length)
+                if not table.available():
+                    if size * size <= AUTO_BUILD_MAX_CELLS:
+                        try:
+                            table.path = write_table(size, win_length)
+                        except OSError as exc:
+                            # cached below, so this is not retried per move
+                            logger.warning(
+                                f"Solver: could not write a table for "
+                                f"{size}x{size} k={win_length} ({exc}), "
+                                f"using the {self.fallback_name} bot"
+                            )
+                            table = None
+                    else:
+                        logger.warning(
+                            f"Solver: no table for {size}x{size} k={win_length}, "
+                            f"run 'python -m rules.solver' to build it"
+                        )
+                        table = None
+            self._tables[key] = table
+        return self._tables[key]
+
+    def choose_move(self, board, player: int, win_length: int, should_stop=None):
+        size = board.size
+        if board.empty_count == 0:
+            return None
+
+        table = self._table(size, win_length or size)
+        if table is not None:
+            result = table.lookup(board.x_mask, board.o_mask)
+            if result is not None and result[1] != _NO_MOVE:
+                return divmod(result[1], size)
+
+        if self._fallback is None:
+            seed = self.rng.getrandbits(32)
+            self._fallback = make_bot(self.fallback_name, seed=seed)
+        return self._fallback.choose_move(board, player, win_length, should_stop)
+
+    def close(self) -> None:
+        for table in self._tables.values():
+            if table is not None:
+                table.close()
+        if self._fallback is not None:
+            self._fallback.close()
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Build perfect-play tables.")
+    parser.add_argument("--size", type=int, choices=SOLVER_SIZES)
+    parser.add_argument("--win", type=int, help="win length (default: all)")
+    args = parser.parse_args(argv)
+
+    sizes = [args.size] if args.size else list(SOLVER_SIZES)
+    for size in sizes:
+        wins = [args.win] if args.win else range(MIN_WIN_LENGTH, size + 1)
+        for win_length in wins:
+            write_table(size, win_length)
+
+
+if __name__ == "__main__":
+    main()
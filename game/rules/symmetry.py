@@ -0,0 +1,119 @@
+# rules/symmetry.py
+from functools import lru_cache
+
+from rules.zobrist import zobrist_keys
+
+# number of symmetries of a square board (rotations and reflections)
+SYMMETRY_COUNT = 8
+
+# how many board sizes keep their tables in memory
+SYMMETRY_CACHE_SIZE = 16
+
+
+def _transform(sym: int, row: int, col: int, last: int) -> tuple[int, int]:
+    if sym == 0:
+        return row, col  # identity
+    if sym == 1:
+        return col, last - row  # rotate 90
+    if sym == 2:
+        return last - row, last - col  # rotate 180
+    if sym == 3:
+        return last - col, row  # rotate 270
+    if sym == 4:
+        return row, last - col  # mirror left-right
+    if sym == 5:
+        return last - row, col  # mirror top-bottom
+    if sym == 6:
+        return col, row  # main diagonal
+    return last - col, last - row  # anti-diagonal
+
+
+class SymmetryTables:
+    """Precomputed cell permutations for the 8 symmetries of a square board.
+
+    ``perms[s][cell]`` is where symmetry ``s`` moves ``cell`` and
+    ``inverse[s]`` undoes it. ``x_keys[cell]`` / ``o_keys[cell]`` hold the
+    Zobrist key of the transformed cell for every symmetry, so all 8 hashes
+    of a position can be updated incrementally with one XOR each.
+    """
+
+    __slots__ = ("size", "perms", "inverse", "x_keys", "o_keys")
+
+    def __init__(self, size: int):
+        self.size = size
+        cells = size * size
+        last = size - 1
+
+        perms = []
+        inverse = []
+        for sym in range(SYMMETRY_COUNT):
+            perm = [0] * cells
+            inv = [0] * cells
+            for row in range(size):
+                for col in range(size):
+                    r, c = _transform(sym, row, col, last)
+                    perm[row * size + col] = r * size + c
+                    inv[r * size + c] = row * size + col
+            perms.append(tuple(perm))
+            inverse.append(tuple(inv))
+        self.perms = tuple(perms)
+        self.inverse = tuple(inverse)
+
+        x_base, o_base = zobrist_keys(cells)
+        self.x_keys = tuple(
+            tuple(x_base[perm[cell]] for perm in self.perms) for cell in range(cells)
+        )
+        self.o_keys = tuple(
+            tuple(o_base[perm[cell]] for perm in self.perms) for cell in range(cells)
+        )
+
+
+@lru_cache(maxsize=SYMMETRY_CACHE_SIZE)
+def symmetry_tables(size: int) -> SymmetryTables:
+    """Return the shared (cached) SymmetryTables for a board size."""
+    return SymmetryTables(size)
+
+
+def transform_mask(mask: int, perm: tuple[int, ...]) -> int:
+    """Apply a cell permutation to a bitmask."""
+    result = 0
+    while mask:
+        low = mask & -mask
+        result |= 1 << perm[low.bit_length() - 1]
+        mask ^= low
+    return result
+
+
+def canonical_form(x_mask: int, o_mask: int, size: int) -> tuple[int, int, int]:
+    """Return (x_mask, o_mask, sym) of the minimal symmetric position.
+
+    ``sym`` is the symmetry that maps the given position onto the canonical
+    one; map a canonical move back with ``symmetry_tables(size).inverse[sym]``.
+    """
+    tables = symmetry_tables(size)
+    best = (x_mask, o_mask)
+    best_sym = 0
+    for sym in range(1, SYMMETRY_COUNT):
+        perm = tables.perms[sym]
+        candidate = (transform_mask(x_mask, perm), transform_mask(o_mask, perm))
+        if candidate < best:
+            best = candidate
+            best_sym = sym
+    return best[0], best[1], best_sym
+
+
+def symmetric_hashes(x_mask: int, o_mask: int, size: int) -> tuple[int, ...]:
+    """Zobrist hash of the position under each of the 8 symmetries.
+
+    ``min()`` of the result is the canonical hash: equal for every rotation
+    or reflection of the position.
+    """
+    tables = symmetry_tables(size)
+    hashes = [0] * SYMMETRY_COUNT
+    for mask, keys in ((x_mask, tables.x_keys), (o_mask, tables.o_keys)):
+        while mask:
+            low = mask & -mask
+            for sym, key in enumerate(keys[low.bit_length() - 1]):
+                hashes[sym] ^= key
+            mask ^= low
+    return tuple(hashes)
@@ -0,0 +1,48 @@
+# rules/transposition.py
+
+# default number of slots
+DEFAULT_TT_SIZE = 1 << 18
+
+# bound type of a stored value
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+
+class TranspositionTable:
+    """Fixed-size table of search results keyed by a position hash.
+
+    Each slot holds a tuple ``(key, depth, value, flag, move, generation)``.
+    Replacement policy: an entry left over from an older search is always
+    overwritten; within the current search a slot keeps the deeper result.
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_TT_SIZE):
+        self.size = max(int(max_entries), 1)
+        self._slots: list[tuple | None] = [None] * self.size
+        self._generation = 0
+
+    def clear(self) -> None:
+        self._slots = [None] * self.size
+        self._generation = 0
+
+    def new_search(self) -> None:
+        """Mark all existing entries as stale (still usable, but replaceable)."""
+        self._generation += 1
+
+    def probe(self, key: int) -> tuple | None:
+        entry = self._slots[key % self.size]
+        if entry is not None and entry[0] == key:
+            return entry
+        return None
+
+    def store(self, key: int, depth: int, value: int, flag: int, move: int) -> None:
+        idx = key % self.size
+        old = self._slots[idx]
+        if (
+            old is None
+            or old[5] != self._generation
+            or old[0] == key
+            or depth >= old[1]
+        ):
+            self._slots[idx] = (key, depth, value, flag, move, self._generation)
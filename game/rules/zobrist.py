@@ -0,0 +1,30 @@
+# rules/zobrist.py
+import random
+from functools import lru_cache
+
+ZOBRIST_SEED = 0x7A0B
+ZOBRIST_BITS = 64
+
+
+@lru_cache(maxsize=None)
+def zobrist_keys(cells: int) -> tuple[tuple[int, ...], tuple[int, ...]]:
+    """Return (x_keys, o_keys): one random key per cell for each player.
+
+    Keys are generated from a fixed seed, so hashes are stable between runs.
+    """
+    rng = random.Random(ZOBRIST_SEED * 1000 + cells)
+    x_keys = tuple(rng.getrandbits(ZOBRIST_BITS) for _ in range(cells))
+    o_keys = tuple(rng.getrandbits(ZOBRIST_BITS) for _ in range(cells))
+    return x_keys, o_keys
+
+
+def zobrist_hash(x_mask: int, o_mask: int, cells: int) -> int:
+    """Hash a position from scratch (use XOR with a cell key to update it)."""
+    x_keys, o_keys = zobrist_keys(cells)
+    h = 0
+    for mask, keys in ((x_mask, x_keys), (o_mask, o_keys)):
+        while mask:
+            low = mask & -mask
+            h ^= keys[low.bit_length() - 1]
+            mask ^= low
+    return h
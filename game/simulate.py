@@ -0,0 +1,141 @@
+# simulate.py
+# Headless batch self-play: plays N games between two bot engines using only
+# model and rules (pygame is never imported) and streams one CSV line per
+# game: game index, winner (1 = X, -1 = O, 0 = draw), number of moves, moves.
+#
+#     python simulate.py --games 100000 --x random --o random
+#     python simulate.py --games 200 --size 5 --win 4 --x iterative:time_budget_ms=50
+#
+# --batch plays random-vs-random games with the numpy engine (rules.batch).
+# --records also appends every game to a binary record file
+# (model.game_record).
+import argparse
+import sys
+import time
+
+from logger_config import logger
+from model.board import Board
+from model.game_record import GameRecord, GameRecordWriter
+from rules.bot import bot_from_spec
+from rules.check_winner import check_winner_at
+
+
+def play_game(x_bot, o_bot, size: int, win_length: int) -> tuple[int, list[int]]:
+    """Play one game; return (winner, moves as flat cell indexes)."""
+    board = Board(size)
+    player = 1
+    moves: list[int] = []
+    while True:
+        bot = x_bot if player == 1 else o_bot
+        row, col = bot.choose_move(board, player, win_length)
+        board.set(row, col, player)
+        moves.append(row * size + col)
+        winner = check_winner_at(board, row, col, win_length)
+        if winner is not None:
+            return winner, moves
+        player = -player
+
+
+def run_simulation(
+    games: int,
+    x_spec: str,
+    o_spec: str,
+    size: int,
+    win_length: int,
+    seed: int | None,
+    out,
+    records: GameRecordWriter | None = None,
+) -> dict[int, int]:
+    """Play games and write results to out (and records); return {winner: count}."""
+    x_seed = None if seed is None else seed * 2
+    o_seed = None if seed is None else seed * 2 + 1
+    x_bot = bot_from_spec(x_spec, seed=x_seed)
+    o_bot = bot_from_spec(o_spec, seed=o_seed)
+
+    totals = {1: 0, -1: 0, 0: 0}
+    write = out.write
+    try:
+        for game in range(games):
+            winner, moves = play_game(x_bot, o_bot, size, win_length)
+            totals[winner] += 1
+            write(f"{game},{winner},{len(moves)},{' '.join(map(str, moves))}\n")
+            if records is not None:
+                records.write(GameRecord(size, win_length, winner, moves))
+    finally:
+        x_bot.close()
+        o_bot.close()
+    return totals
+
+
+def run_batch_simulation(
+    games: int,
+    size: int,
+    win_length: int,
+    seed: int | None,
+    out,
+    records: GameRecordWriter | None = None,
+) -> dict[int, int]:
+    """Random-vs-random games on the vectorized engine; same output format."""
+    from rules.batch import BatchGames  # numpy is only needed here
+
+    batch = BatchGames(games, size, win_length, seed)
+    results = batch.play_random()
+
+    write = out.write
+    for game in range(games):
+        count = int(batch.move_count[game])
+        cells = batch.moves[game, :count].tolist()
+        write(f"{game},{int(results[game])},{count},{' '.join(map(str, cells))}\n")
+        if records is not None:
+            records.write(GameRecord(size, win_length, int(results[game]), cells))
+    return {value: int((results == value).sum()) for value in (1, -1, 0)}
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Headless bot-vs-bot games.")
+    parser.add_argument("--games", type=int, default=1000)
+    parser.add_argument("--size", type=int, default=3)
+    parser.add_argument("--win", type=int, default=None, help="default: size")
+    parser.add_argument("--x", default="random", help="bot spec for X")
+    parser.add_argument("--o", default="random", help="bot spec for O")
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--out", default="-", help="result file, '-' = stdout")
+    parser.add_argument("--records", default=None, help="also append binary records here")
+    parser.add_argument(
+        "--batch", action="store_true", help="random games on the numpy engine"
+    )
+    args = parser.parse_args(argv)
+    if args.batch and (args.x, args.o) != ("random", "random"):
+        parser.error("--batch only plays random vs random, drop --x/--o")
+
+    win_length = args.win or args.size
+    out = sys.stdout if args.out == "-" else open(args.out, "w", buffering=1 << 16)
+    records = GameRecordWriter(args.records) if args.records else None
+
+    started = time.perf_counter()
+    try:
+        if args.batch:
+            totals = run_batch_simulation(
+                args.games, args.size, win_length, args.seed, out, records
+            )
+        else:
+            totals = run_simulation(
+                args.games, args.x, args.o, args.size, win_length, args.seed, out,
+                records,
+            )
+    finally:
+        if out is not sys.stdout:
+            out.close()
+        if records is not None:
+            records.close()
+    elapsed = time.perf_counter() - started
+
+    logger.info(
+        f"Simulation: {args.games} games in {elapsed:.2f}s "
+        f"({args.games / max(elapsed, 1e-9):.0f} games/s), "
+        f"X wins={totals[1]}, O wins={totals[-1]}, draws={totals[0]}"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+# startup_bench.py
+# Cold start benchmark: runs the game in fresh interpreters under
+# -X importtime, exits after the first menu frame and reports the median
+# interpreter start, `import app` and time to first frame, plus the slowest
+# modules imported by app.
+#
+#     python startup_bench.py --runs 10
+#     python startup_bench.py --window --json startup.json
+#
+# Without --window SDL's dummy video driver is used, so it runs headless.
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+from collections import defaultdict
+from pathlib import Path
+
+GAME_DIR = Path(__file__).resolve().parent
+
+# timings are printed on the last stdout line; run() exits via sys.exit
+_CHILD = """
+import json, time
+started = time.perf_counter()
+import app
+imported = time.perf_counter()
+try:
+    app.run(max_frames=1)
+finally:
+    print(json.dumps({
+        "import_ms": (imported - started) * 1000,
+        "first_frame_ms": (time.perf_counter() - started) * 1000,
+    }))
+"""
+
+
+def _child_env(window: bool) -> dict:
+    env = dict(os.environ)
+    env.setdefault("GAME_LOG_LEVEL", "WARNING")
+    env["PYGAME_HIDE_SUPPORT_PROMPT"] = "1"
+    if not window:
+        env["SDL_VIDEODRIVER"] = "dummy"
+        env["SDL_AUDIODRIVER"] = "dummy"
+    return env
+
+
+def _parse_importtime(stderr: str) -> dict[str, int]:
+    """Cumulative microseconds of each module imported directly by app."""
+    children: dict[str, int] = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # column header
+        # nested imports are indented two spaces per level and listed
+        # before the module that imported them
+        depth = (len(name) - len(name.lstrip()) - 1) // 2
+        if depth == 1:
+            children[name.strip()] = int(cumulative)
+        elif depth == 0:
+            if name.strip() == "app":
+                return children
+            children = {}
+    return {}
+
+
+def measure(window: bool = False) -> tuple[dict, dict[str, int]]:
+    """Start the game once; return (timings in ms, import costs of app)."""
+    env = _child_env(window)
+
+    started = time.perf_counter()
+    subprocess.run([sys.executable, "-c", "pass"], cwd=GAME_DIR, env=env, check=True)
+    interpreter_ms = (time.perf_counter() - started) * 1000
+
+    started = time.perf_counter()
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", _CHILD],
+        cwd=GAME_DIR, env=env, capture_output=True, text=True,
+    )
+    process_ms = (time.perf_counter() - started) * 1000
+    if proc.returncode != 0:
+        raise RuntimeError(f"Game failed to start:\n{proc.stderr[-2000:]}")
+
+    timings = json.loads(proc.stdout.strip().splitlines()[-1])
+    timings["interpreter_ms"] = interpreter_ms
+    timings["process_ms"] = process_ms
+    return timings, _parse_importtime(proc.stderr)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Game cold start benchmark.")
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=10, help="slowest imports shown")
+    parser.add_argument("--window", action="store_true", help="open a real window")
+    parser.add_argument("--json", default=None, help="also write results here")
+    args = parser.parse_args(argv)
+
+    runs = [measure(args.window) for _ in range(max(args.runs, 1))]
+
+    timings = {
+        key: statistics.median(t[key] for t, _ in runs) for key in runs[0][0]
+    }
+    imports = defaultdict(list)
+    for _, costs in runs:
+        for name, us in costs.items():
+            imports[name].append(us)
+    slowest = sorted(
+        ((statistics.median(us) / 1000, name) for name, us in imports.items()),
+        reverse=True,
+    )[: args.top]
+
+    print(f"median of {len(runs)} runs")
+    print(f"interpreter start  {timings['interpreter_ms']:8.1f} ms")
+    print(f"import app         {timings['import_ms']:8.1f} ms")
+    print(f"first frame        {timings['first_frame_ms']:8.1f} ms  (after start)")
+    print(f"whole process      {timings['process_ms']:8.1f} ms")
+    print("slowest imports of app (cumulative):")
+    for ms, name in slowest:
+        print(f"  {name:<24} {ms:8.1f} ms")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(
+                {"runs": len(runs), "timings_ms": timings,
+                 "imports_ms": {name: ms for ms, name in slowest}},
+                fh, indent=2,
+            )
+
+
+if __name__ == "__main__":
+    main()
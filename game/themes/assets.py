@@ -0,0 +1,101 @@
+# themes/assets.py
+# Shared cache of decoded theme images.
+#
+# Files are decoded once per (path, mtime) on a background thread; the
+# main loop is woken with ASSET_READY_EVENT when a decode finishes.
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import pygame
+
+from logger_config import logger
+
+ASSET_READY_EVENT = pygame.USEREVENT + 2
+
+
+def _notify(future: Future) -> None:
+    try:
+        pygame.event.post(pygame.event.Event(ASSET_READY_EVENT))
+    except pygame.error:
+        pass  # no event queue (headless use), callers poll instead
+
+
+class AssetCache:
+    """
+    Decoded images keyed by (path, mtime, variant), so an edited file is
+    decoded again; variant tells apart one file decoded in different ways.
+
+    request() starts decoding in the background and returns immediately;
+    get() returns the image once it is ready, converted for fast blitting
+    (conversion needs the display, so it happens on the calling thread).
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._executor: ThreadPoolExecutor | None = None
+        self._futures: dict[tuple[str, int, str], Future] = {}
+        self._images: dict[tuple[str, int, str], pygame.Surface] = {}
+
+    @staticmethod
+    def key(path: Path, variant: str = "") -> tuple[str, int, str]:
+        """Cache key of a file; raises OSError if it does not exist."""
+        return str(path), path.stat().st_mtime_ns, variant
+
+    def request(self, path: Path, decode=None, variant: str = "") -> Future:
+        """Start decoding path (once per version and variant); return its future.
+
+        decode(path) defaults to pygame.image.load and must not touch the
+        display.
+        """
+        key = self.key(path, variant)
+        with self._lock:
+            future = self._futures.get(key)
+            if future is None:
+                # an older version of the file is not needed any more
+                stale = [k for k in self._futures if k[0] == key[0] and k[2] == variant]
+                for old in stale:
+                    self._futures.pop(old)
+                    self._images.pop(old, None)
+
+                if self._executor is None:
+                    self._executor = ThreadPoolExecutor(
+                        max_workers=1, thread_name_prefix="theme-assets"
+                    )
+                future = self._executor.submit(decode or _load_image, path)
+                future.add_done_callback(_notify)
+                self._futures[key] = future
+                logger.debug("Assets: decoding {}", path.name)
+        return future
+
+    def get(self, path: Path, variant: str = ""):
+        """Return the decoded asset, None while pending; re-raises decode errors."""
+        key = self.key(path, variant)
+        image = self._images.get(key)
+        if image is not None:
+            return image
+
+        with self._lock:
+            future = self._futures.get(key)
+        if future is None or not future.done():
+            return None
+
+        image = future.result()
+        # surfaces and sprite atlases alike
+        if hasattr(image, "convert_alpha"):
+            image = image.convert_alpha()
+        self._images[key] = image
+        return image
+
+    def close(self) -> None:
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _load_image(path: Path) -> pygame.Surface:
+    return pygame.image.load(str(path))
+
+
+# shared by every theme
+assets = AssetCache()
@@ -0,0 +1,159 @@
+# themes/atlas.py
+# Sprite atlases: every frame of an animation packed into one surface.
+#
+# Decoded GIF atlases are cached on disk as raw RGBA, so only the first
+# start after a GIF changes pays for decoding it.
+import bisect
+import itertools
+import math
+import struct
+from pathlib import Path
+
+import pygame
+
+from logger_config import logger
+from themes.gif import decode_gif
+
+ATLAS_CACHE_DIR = Path(__file__).with_name("cache")
+
+_MAGIC = b"TTA1"
+# magic, frame width, frame height, columns, frame count
+_HEADER = struct.Struct("<4sHHHH")
+
+
+class SpriteAtlas:
+    """
+    Frames of one animation packed into a single surface.
+
+    rects[i] is frame i inside surface and durations[i] how long it is
+    shown (ms). The animation loops, so frame_at() takes any time in ms.
+    """
+
+    __slots__ = ("surface", "rects", "durations", "period", "_ends")
+
+    def __init__(self, surface: pygame.Surface, rects: list[pygame.Rect],
+                 durations: list[int]) -> None:
+        self.surface = surface
+        self.rects = rects
+        self.durations = [max(int(d), 1) for d in durations]
+        self._ends = list(itertools.accumulate(self.durations))
+        self.period = self._ends[-1]
+
+    @property
+    def frame_size(self) -> tuple[int, int]:
+        return self.rects[0].size
+
+    def frame_at(self, time_ms: int) -> int:
+        """Index of the frame shown time_ms after the animation started."""
+        return bisect.bisect_right(self._ends, time_ms % self.period)
+
+    def next_change_in(self, time_ms: int) -> int:
+        """Milliseconds from time_ms until the next frame is shown."""
+        t = time_ms % self.period
+        return self._ends[bisect.bisect_right(self._ends, t)] - t
+
+    def convert_alpha(self) -> "SpriteAtlas":
+        """Same atlas with the surface converted for fast blitting."""
+        return SpriteAtlas(self.surface.convert_alpha(), self.rects, self.durations)
+
+    def scaled(self, frame_size: tuple[int, int]) -> "SpriteAtlas":
+        """New atlas with every frame smoothscaled to frame_size."""
+        frames = [
+            pygame.transform.smoothscale(self.surface.subsurface(rect), frame_size)
+            for rect in self.rects
+        ]
+        return SpriteAtlas.pack(frames, self.durations)
+
+    @classmethod
+    def from_strip(cls, strip: pygame.Surface, frames: int,
+                   duration_ms: int) -> "SpriteAtlas":
+        """Use a horizontal strip of equal frames as an atlas (no copying)."""
+        frame_w = strip.get_width() // frames
+        rects = [pygame.Rect(i * frame_w, 0, frame_w, strip.get_height())
+                 for i in range(frames)]
+        return cls(strip, rects, [duration_ms] * frames)
+
+    @classmethod
+    def pack(cls, frames: list[pygame.Surface], durations: list[int]) -> "SpriteAtlas":
+        """Pack equally sized frames into a near-square grid."""
+        frame_w, frame_h = frames[0].get_size()
+        columns = _columns(len(frames))
+        rows = -(-len(frames) // columns)
+        surface = pygame.Surface((columns * frame_w, rows * frame_h), pygame.SRCALPHA)
+
+        rects = []
+        for i, frame in enumerate(frames):
+            rect = pygame.Rect((i % columns) * frame_w, (i // columns) * frame_h,
+                               frame_w, frame_h)
+            surface.blit(frame, rect)
+            rects.append(rect)
+        return cls(surface, rects, durations)
+
+
+def _columns(frames: int) -> int:
+    return max(math.ceil(math.sqrt(frames)), 1)
+
+
+def _cache_path(path: Path) -> Path:
+    stat = path.stat()
+    return ATLAS_CACHE_DIR / f"{path.stem}.{stat.st_size}.{stat.st_mtime_ns}.atlas"
+
+
+def _write_cache(atlas: SpriteAtlas, path: Path, cache_path: Path) -> None:
+    frame_w, frame_h = atlas.frame_size
+    header = _HEADER.pack(_MAGIC, frame_w, frame_h, _columns(len(atlas.rects)),
+                          len(atlas.rects))
+    durations = struct.pack(f"<{len(atlas.durations)}I", *atlas.durations)
+
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    # older versions of the same file are stale now
+    for old in cache_path.parent.glob(f"{path.stem}.*.*.atlas"):
+        old.unlink(missing_ok=True)
+
+    tmp_path = cache_path.with_suffix(".tmp")
+    with open(tmp_path, "wb") as fh:
+        fh.write(header)
+        fh.write(durations)
+        fh.write(pygame.image.tobytes(atlas.surface, "RGBA"))
+    tmp_path.replace(cache_path)
+
+
+def _read_cache(cache_path: Path) -> SpriteAtlas:
+    data = cache_path.read_bytes()
+    magic, frame_w, frame_h, columns, count = _HEADER.unpack_from(data)
+    if magic != _MAGIC or not count or not columns:
+        raise ValueError(f"Invalid atlas cache: {cache_path}")
+
+    pos = _HEADER.size
+    durations = list(struct.unpack_from(f"<{count}I", data, pos))
+    pos += 4 * count
+
+    rows = -(-count // columns)
+    size = (columns * frame_w, rows * frame_h)
+    surface = pygame.image.frombytes(data[pos:], size, "RGBA")
+    rects = [pygame.Rect((i % columns) * frame_w, (i // columns) * frame_h, frame_w, frame_h)
+             for i in range(count)]
+    return SpriteAtlas(surface, rects, durations)
+
+
+def load_gif_atlas(path: Path) -> SpriteAtlas:
+    """Decode a GIF into an atlas, using the on-disk cache when it is fresh.
+
+    Does not need the display, so it can run on the asset thread.
+    """
+    cache_path = _cache_path(path)
+    if cache_path.exists():
+        try:
+            return _read_cache(cache_path)
+        except (ValueError, struct.error, pygame.error) as exc:
+            logger.warning(f"Atlas: ignoring cache {cache_path.name}: {exc}")
+
+    _, frames = decode_gif(path.read_bytes())
+    atlas = SpriteAtlas.pack([frame for frame, _ in frames],
+                             [duration for _, duration in frames])
+    try:
+        _write_cache(atlas, path, cache_path)
+    except OSError as exc:
+        logger.warning(f"Atlas: could not write cache {cache_path.name}: {exc}")
+    logger.info(f"Atlas: decoded {path.name}, {len(frames)} frames")
+    return atlas
@@ -0,0 +1,185 @@
+# themes/gif.py
+# GIF decoder for animated themes: pygame.image.load only returns the first
+# frame. Frames are composited (transparency and disposal applied) and
+# returned as RGBA surfaces; no display is needed, so it runs in the asset
+# thread.
+import struct
+
+import pygame
+
+# GIF delays this short are shown at 100 ms, as browsers do
+MIN_DELAY_MS = 20
+DEFAULT_DELAY_MS = 100
+
+_MAX_CODES = 4096
+_TRANSPARENT = b"\x00\x00\x00\x00"
+
+# row order of an interlaced image: (first row, step) per pass
+_INTERLACE_PASSES = ((0, 8), (4, 8), (2, 4), (1, 2))
+
+
+def _read_sub_blocks(data: bytes, pos: int) -> tuple[bytes, int]:
+    chunks = []
+    while True:
+        size = data[pos]
+        pos += 1
+        if size == 0:
+            return b"".join(chunks), pos
+        chunks.append(data[pos : pos + size])
+        pos += size
+
+
+def _read_palette(data: bytes, pos: int, packed: int) -> tuple[list[bytes], int]:
+    count = 2 << (packed & 0x07)
+    palette = [
+        data[pos + 3 * i : pos + 3 * i + 3] + b"\xff" for i in range(count)
+    ]
+    # out-of-range indexes in broken files show as transparent
+    palette += [_TRANSPARENT] * (256 - count)
+    return palette, pos + 3 * count
+
+
+def lzw_decode(data: bytes, min_code_size: int, pixel_count: int) -> bytes:
+    """Decode GIF LZW image data into palette indexes."""
+    clear = 1 << min_code_size
+    end = clear + 1
+    table = [bytes((i,)) for i in range(clear)] + [b"", b""]
+    size = min_code_size + 1
+    mask = (1 << size) - 1
+
+    out = bytearray()
+    prev = None
+    acc = 0
+    bits = 0
+    for byte in data:
+        acc |= byte << bits
+        bits += 8
+        while bits >= size:
+            code = acc & mask
+            acc >>= size
+            bits -= size
+
+            if code == clear:
+                del table[clear + 2 :]
+                size = min_code_size + 1
+                mask = (1 << size) - 1
+                prev = None
+                continue
+            if code == end:
+                return bytes(out[:pixel_count])
+
+            if prev is None:
+                entry = table[code]
+            elif code < len(table):
+                entry = table[code]
+                if len(table) < _MAX_CODES:
+                    table.append(prev + entry[:1])
+            elif code == len(table):
+                entry = prev + prev[:1]
+                if len(table) < _MAX_CODES:
+                    table.append(entry)
+            else:
+                raise ValueError("Corrupt GIF: invalid LZW code")
+
+            out += entry
+            prev = entry
+            if len(table) > mask and size < 12:
+                size += 1
+                mask = (1 << size) - 1
+
+    return bytes(out[:pixel_count])
+
+
+def _deinterlace(indexes: bytes, width: int, height: int) -> bytes:
+    rows = [indexes[i * width : (i + 1) * width] for i in range(height)]
+    ordered = [b""] * height
+    source = iter(rows)
+    for first, step in _INTERLACE_PASSES:
+        for row in range(first, height, step):
+            ordered[row] = next(source)
+    return b"".join(ordered)
+
+
+def decode_gif(data: bytes) -> tuple[tuple[int, int], list[tuple[pygame.Surface, int]]]:
+    """Decode every frame of a GIF.
+
+    Returns ((width, height), [(frame surface, duration ms), ...]); each
+    frame is the full composited canvas as an SRCALPHA surface.
+    """
+    if data[:6] not in (b"GIF87a", b"GIF89a"):
+        raise ValueError("Not a GIF file")
+
+    width, height, packed = struct.unpack_from("<HHB", data, 6)
+    pos = 13
+    global_palette = None
+    if packed & 0x80:
+        global_palette, pos = _read_palette(data, pos, packed)
+
+    canvas = pygame.Surface((width, height), pygame.SRCALPHA)
+    frames: list[tuple[pygame.Surface, int]] = []
+
+    # graphic control extension applies to the next image only
+    delay_ms = DEFAULT_DELAY_MS
+    disposal = 0
+    transparent = None
+
+    while pos < len(data):
+        block = data[pos]
+        pos += 1
+
+        if block == 0x3B:  # trailer
+            break
+
+        if block == 0x21:  # extension
+            label = data[pos]
+            pos += 1
+            payload, pos = _read_sub_blocks(data, pos)
+            if label == 0xF9 and len(payload) >= 4:
+                flags, delay, index = struct.unpack_from("<BHB", payload)
+                disposal = (flags >> 2) & 0x07
+                transparent = index if flags & 0x01 else None
+                delay_ms = delay * 10
+                if delay_ms < MIN_DELAY_MS:
+                    delay_ms = DEFAULT_DELAY_MS
+            continue
+
+        if block != 0x2C:
+            raise ValueError(f"Corrupt GIF: unexpected block 0x{block:02x}")
+
+        left, top, frame_w, frame_h, flags = struct.unpack_from("<HHHHB", data, pos)
+        pos += 9
+        palette = global_palette
+        if flags & 0x80:
+            palette, pos = _read_palette(data, pos, flags)
+        if palette is None:
+            raise ValueError("Corrupt GIF: image without a color table")
+
+        min_code_size = data[pos]
+        image_data, pos = _read_sub_blocks(data, pos + 1)
+        indexes = lzw_decode(image_data, min_code_size, frame_w * frame_h)
+        indexes = indexes.ljust(frame_w * frame_h, b"\x00")
+        if flags & 0x40:
+            indexes = _deinterlace(indexes, frame_w, frame_h)
+
+        if transparent is not None:
+            palette = palette[:]
+            palette[transparent] = _TRANSPARENT
+        rgba = b"".join(map(palette.__getitem__, indexes))
+        image = pygame.image.frombytes(rgba, (frame_w, frame_h), "RGBA")
+
+        previous = canvas.copy() if disposal == 3 else None
+        canvas.blit(image, (left, top))
+        frames.append((canvas.copy(), delay_ms))
+
+        if disposal == 2:
+            canvas.fill((0, 0, 0, 0), pygame.Rect(left, top, frame_w, frame_h))
+        elif disposal == 3:
+            canvas = previous
+
+        delay_ms = DEFAULT_DELAY_MS
+        disposal = 0
+        transparent = None
+
+    if not frames:
+        raise ValueError("GIF has no frames")
+    return (width, height), frames
@@ -1,13 +1,19 @@
 import json
+from functools import partial
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 import pygame
 from logger_config import logger
 from config import BASE_SIZE, GRID_SIZE
+from themes.assets import assets
+from themes.atlas import SpriteAtlas, load_gif_atlas
+from ui.renderer import clear_scaled_images
 
 
 ThemeDict = Dict[str, Any]
 
+CLASSIC_THEME: ThemeDict = {"id": "classic", "name": "Classic X/O", "type": "builtin"}
+
 
 def _themes_json_path() -> Path:
     """Return path to themes.json."""
@@ -49,144 +55,150 @@ def load_themes() -> List[ThemeDict]:
     return themes
 
 
-def _load_image_from_theme(base_dir: Path, rel_path: str) -> Optional[pygame.Surface]:
-    """Load image for mark from theme folder."""
-    full_path = base_dir / rel_path
-    if not full_path.exists():
-        logger.error(f"Theme image not found: {full_path}")
-        return None
-
-    try:
-        image = pygame.image.load(str(full_path)).convert_alpha()
-    except Exception as exc:
-        logger.error(f"Failed to load theme image {full_path}: {exc}")
-        return None
+def _theme_files(theme: ThemeDict) -> Optional[List[str]]:
+    """Relative image paths a theme needs; None (and an error) if misconfigured."""
+    theme_type = theme.get("type", "builtin")
 
-    return image
+    if theme_type == "image":
+        x_rel = theme.get("x_image")
+        o_rel = theme.get("o_image")
+        if not x_rel or not o_rel:
+            logger.error("Image theme must have 'x_image' and 'o_image'")
+            return None
+        return [x_rel, o_rel]
 
+    if theme_type == "animated":
+        # GIFs carry their own frames and timing, strips need 'frames'
+        x_gif_rel = theme.get("x_gif")
+        o_gif_rel = theme.get("o_gif")
+        if x_gif_rel and o_gif_rel:
+            return [x_gif_rel, o_gif_rel]
 
-def _split_strip_to_frames(strip: pygame.Surface, frames: int) -> List[pygame.Surface]:
-    """Split horizontal strip into a list of frame surfaces."""
-    if frames <= 0:
-        return []
+        x_strip_rel = theme.get("x_strip")
+        o_strip_rel = theme.get("o_strip")
+        if not x_strip_rel or not o_strip_rel or int(theme.get("frames", 1)) <= 0:
+            logger.error(
+                "Animated theme needs 'x_gif' and 'o_gif', "
+                "or 'x_strip', 'o_strip' and positive 'frames'"
+            )
+            return None
+        return [x_strip_rel, o_strip_rel]
 
-    width = strip.get_width()
-    height = strip.get_height()
-    frame_width = width // frames
+    logger.error(f"Unknown theme type: {theme_type}")
+    return None
 
-    result: List[pygame.Surface] = []
-    for i in range(frames):
-        rect = pygame.Rect(i * frame_width, 0, frame_width, height)
-        frame = strip.subsurface(rect).copy()
-        result.append(frame)
-    return result
 
+def _load_prepared(theme: ThemeDict, path: Path):
+    """Decode one theme image and scale it (a surface or sprite atlas).
 
-def apply_theme(menu_state, theme: ThemeDict) -> None:
-    """Apply selected theme to menu_state (set images and metadata)."""
-    theme_id = theme.get("id", "classic")
-    theme_name = theme.get("name", theme_id)
-    theme_type = theme.get("type", "builtin")
+    Runs on the asset thread, so it must not touch the display.
+    """
+    cell_size = BASE_SIZE // GRID_SIZE
+    target_size = int(cell_size * 0.8)
+
+    if path.suffix.lower() == ".gif":
+        image = load_gif_atlas(path)
+    else:
+        image = pygame.image.load(str(path))
+        if image.get_bitsize() < 24:
+            # smoothscale needs 24 or 32 bits; convert() would need the display
+            rgba = pygame.Surface(image.get_size(), pygame.SRCALPHA)
+            rgba.blit(image, (0, 0))
+            image = rgba
+
+    if theme.get("type") == "image":
+        return pygame.transform.smoothscale(image, (target_size, target_size))
+
+    # animated: every frame lives in one atlas, the renderer picks the frame
+    if not isinstance(image, SpriteAtlas):
+        frames = int(theme.get("frames", 1))
+        frame_duration = int(theme.get("frame_duration_ms", 80))
+        image = SpriteAtlas.from_strip(image, frames, frame_duration)
+    return image.scaled((target_size, target_size))
 
-    menu_state.selected_theme_id = theme_id
-    menu_state.selected_theme_name = theme_name
 
-    # reset animation by default
-    menu_state.animation_frames_x = []
-    menu_state.animation_frames_o = []
-    menu_state.animation_frame_duration_ms = 0
+def _reset_images(menu_state) -> None:
+    menu_state.player_x_image = None
+    menu_state.player_o_image = None
 
-    # 1) builtin: standart X/O
-    if theme_type == "builtin":
-        menu_state.player_x_image = None
-        menu_state.player_o_image = None
-        return
 
-    base_dir = _themes_json_path().parent
+def apply_theme(menu_state, theme: ThemeDict) -> None:
+    """Apply selected theme to menu_state (set images and metadata).
 
-    # 2) static images
-    if theme_type == "image":
-        x_rel = theme.get("x_image")
-        o_rel = theme.get("o_image")
+    Image files are decoded and scaled in the background by the shared
+    asset cache. Until they are ready the builtin marks are shown as a placeholder and
+    menu_state.pending_theme is set; poll_pending_theme() finishes the job.
+    """
+    theme_id = theme.get("id", "classic")
+    theme_name = theme.get("name", theme_id)
+    theme_type = theme.get("type", "builtin")
 
-        if not x_rel or not o_rel:
-            logger.error("Image theme must have 'x_image' and 'o_image'")
-            menu_state.player_x_image = None
-            menu_state.player_o_image = None
+    paths: List[Path] = []
+    if theme_type != "builtin":
+        rel_paths = _theme_files(theme)
+        if rel_paths is None:
             return
 
-        x_img = _load_image_from_theme(base_dir, x_rel)
-        o_img = _load_image_from_theme(base_dir, o_rel)
-
-        if x_img is None or o_img is None:
+        base_dir = _themes_json_path().parent
+        paths = [base_dir / rel for rel in rel_paths]
+        missing = [path for path in paths if not path.exists()]
+        if missing:
+            for path in missing:
+                logger.error(f"Theme image not found: {path}")
             logger.error("Failed to load theme images, keeping previous")
             return
 
-        from config import BASE_SIZE, GRID_SIZE  # локальный импорт, чтобы избежать циклов
+    menu_state.selected_theme_id = theme_id
+    menu_state.selected_theme_name = theme_name
+    menu_state.pending_theme = None
 
-        cell_size = BASE_SIZE // GRID_SIZE
-        target_size = int(cell_size * 0.8)
+    # images scaled for the previous theme are not needed any more
+    clear_scaled_images()
+    _reset_images(menu_state)
 
-        menu_state.player_x_image = pygame.transform.smoothscale(
-            x_img, (target_size, target_size)
-        )
-        menu_state.player_o_image = pygame.transform.smoothscale(
-            o_img, (target_size, target_size)
-        )
+    # 1) builtin: standart X/O
+    if theme_type == "builtin":
         return
 
-    # 3) animated theme
-    if theme_type == "animated":
-        x_strip_rel = theme.get("x_strip")
-        o_strip_rel = theme.get("o_strip")
-        frames = int(theme.get("frames", 1))
-        frame_duration = int(theme.get("frame_duration_ms", 80))
-
-        if not x_strip_rel or not o_strip_rel or frames <= 0:
-            logger.error("Animated theme needs 'x_strip', 'o_strip' and positive 'frames'")
-            return
-
-        x_strip = _load_image_from_theme(base_dir, x_strip_rel)
-        o_strip = _load_image_from_theme(base_dir, o_strip_rel)
-
-        if x_strip is None or o_strip is None:
-            logger.error("Failed to load animated strips, keeping previous")
-            return
-
-        cell_size = BASE_SIZE // GRID_SIZE
-        target_size = int(cell_size * 0.8)
+    # 2) image / animated: decode in the background, builtin marks meanwhile;
+    # one file can be scaled differently by two themes, hence the variant
+    for path in paths:
+        assets.request(path, partial(_load_prepared, theme), theme_id)
+    menu_state.pending_theme = (theme, paths)
+    poll_pending_theme(menu_state)
+    if menu_state.pending_theme is not None:
+        logger.info(f"Theme {theme_id}: loading images in background")
 
-        x_frames = _split_strip_to_frames(x_strip, frames)
-        o_frames = _split_strip_to_frames(o_strip, frames)
-
-        if not x_frames or not o_frames:
-            logger.error("Animated theme produced no frames")
-            return
 
-        scaled_x_frames: list[pygame.Surface] = []
-        scaled_o_frames: list[pygame.Surface] = []
+def poll_pending_theme(menu_state) -> bool:
+    """Finish applying a theme whose images are decoded; True if applied."""
+    pending = menu_state.pending_theme
+    if pending is None:
+        return False
 
-        for f in x_frames:
-            scaled_x_frames.append(
-                pygame.transform.smoothscale(f, (target_size, target_size))
-            )
-        for f in o_frames:
-            scaled_o_frames.append(
-                pygame.transform.smoothscale(f, (target_size, target_size))
-            )
+    theme, paths = pending
+    theme_id = theme.get("id", "classic")
+    try:
+        images = [assets.get(path, theme_id) for path in paths]
+        if any(image is None for image in images):
+            return False
+    except Exception as exc:
+        logger.error(f"Failed to load theme images for {theme_id}: {exc}")
+        menu_state.pending_theme = None
+        apply_theme(menu_state, CLASSIC_THEME)
+        return False
 
-        menu_state.animation_frames_x = scaled_x_frames
-        menu_state.animation_frames_o = scaled_o_frames
-        menu_state.animation_frame_duration_ms = frame_duration
+    menu_state.pending_theme = None
 
-        
-        menu_state.player_x_image = scaled_x_frames[0]
-        menu_state.player_o_image = scaled_o_frames[0]
+    # already scaled on the asset thread, and reused while the files are
+    # unchanged
+    x_image, o_image = images
+    menu_state.player_x_image = x_image
+    menu_state.player_o_image = o_image
 
+    if isinstance(x_image, SpriteAtlas):
         logger.info(
-            f"Animated theme applied: {theme_id}, frames={frames}, duration={frame_duration}ms"
+            f"Animated theme applied: {theme_id}, "
+            f"frames={len(x_image.rects)}, period={x_image.period}ms"
         )
-        return
-
-    # unknown type
-    logger.error(f"Unknown theme type: {theme_type}")
+    return True
@@ -0,0 +1,246 @@
+# tournament.py
+# Round-robin bot tournament across a process pool.
+#
+# Every ordered pair of bots plays --games games per board configuration
+# (so each bot plays both colors). Seeds are derived from --seed, the
+# configuration, the pairing and the game number, so a run is reproducible
+# regardless of worker count.
+#
+#     python tournament.py --bots random iterative:time_budget_ms=50 \
+#         "mcts:workers=1,iterations=500" --configs 3:3 4:3 5:4 --games 10
+import argparse
+import json
+import math
+import os
+import random
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
+
+from logger_config import logger
+from model.game_state import GameState
+from rules.bot import bot_from_spec
+
+ELO_BASE = 1500.0
+ELO_ITERATIONS = 500
+PERCENTILES = (50, 90, 99)
+
+
+def _quiet_worker() -> None:
+    """Drop log sinks in worker processes: GameState logs every move."""
+    logger.remove()
+
+
+def _derive_seed(*parts) -> int:
+    return random.Random(":".join(map(str, parts))).getrandbits(32)
+
+
+def _match_bot(spec: str, seed: int):
+    defaults = {"seed": seed}
+    if spec.partition(":")[0].strip() == "mcts":
+        # matches already run in a process pool; an MCTS pool of cpu_count
+        # workers in every match would oversubscribe the machine
+        defaults["workers"] = 1
+    return bot_from_spec(spec, **defaults)
+
+
+def play_match(task: tuple) -> dict:
+    """Play one game; task = (seed, size, win_length, x_spec, o_spec)."""
+    seed, size, win_length, x_spec, o_spec = task
+    bots = {
+        1: _match_bot(x_spec, _derive_seed(seed, "x")),
+        -1: _match_bot(o_spec, _derive_seed(seed, "o")),
+    }
+    latencies: dict[int, list[float]] = {1: [], -1: []}
+
+    state = GameState(size, win_length)
+    winner = None
+    forfeit = None
+    try:
+        while winner is None:
+            player = state.current_player
+            started = time.perf_counter()
+            move = bots[player].choose_move(state.board, player, state.win_length)
+            latencies[player].append((time.perf_counter() - started) * 1000.0)
+
+            played = len(state.moves)
+            if move is not None:
+                state.apply_move(*move)
+            if len(state.moves) == played:
+                # no move or an illegal one: asking again would loop forever
+                forfeit = x_spec if player == 1 else o_spec
+                winner = -player
+            else:
+                winner = state.winner
+    finally:
+        for bot in bots.values():
+            bot.close()
+
+    return {
+        "config": f"{size}x{size}:{win_length}",
+        "x": x_spec,
+        "o": o_spec,
+        "winner": winner,
+        "forfeit": forfeit,
+        "x_ms": latencies[1],
+        "o_ms": latencies[-1],
+    }
+
+
+def build_tasks(
+    bots: list[str], configs: list[tuple[int, int]], games: int, seed: int
+) -> list[tuple]:
+    tasks = []
+    for size, win_length in configs:
+        for x_spec in bots:
+            for o_spec in bots:
+                if x_spec == o_spec:
+                    continue
+                for game in range(games):
+                    game_seed = _derive_seed(
+                        seed, size, win_length, x_spec, o_spec, game
+                    )
+                    tasks.append((game_seed, size, win_length, x_spec, o_spec))
+    return tasks
+
+
+def _expected(rating: float, other: float) -> float:
+    return 1.0 / (1.0 + 10 ** ((other - rating) / 400))
+
+
+def estimate_elo(results: list[dict], bots: list[str]) -> dict[str, float]:
+    """Fit Elo ratings to all games (draw = half point), mean ELO_BASE.
+
+    Each bot also gets one virtual draw against an ELO_BASE player, which
+    keeps ratings finite for bots that never lose or never win.
+    """
+    ratings = {bot: ELO_BASE for bot in bots}
+    games = [
+        (r["x"], r["o"], {1: 1.0, 0: 0.5, -1: 0.0}[r["winner"]]) for r in results
+    ]
+    if not games:
+        return ratings
+
+    played = {bot: 0 for bot in bots}
+    for x_spec, o_spec, _ in games:
+        played[x_spec] += 1
+        played[o_spec] += 1
+
+    for _ in range(ELO_ITERATIONS):
+        delta = {bot: 0.5 - _expected(ratings[bot], ELO_BASE) for bot in bots}
+        for x_spec, o_spec, score in games:
+            surprise = score - _expected(ratings[x_spec], ratings[o_spec])
+            delta[x_spec] += surprise
+            delta[o_spec] -= surprise
+        for bot in bots:
+            if played[bot]:
+                ratings[bot] += 32.0 * delta[bot] / math.sqrt(played[bot])
+        shift = ELO_BASE - sum(ratings.values()) / len(ratings)
+        ratings = {bot: rating + shift for bot, rating in ratings.items()}
+    return ratings
+
+
+def percentile(values: list[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    return ordered[low] + (ordered[high] - ordered[low]) * (rank - low)
+
+
+def summarize(results: list[dict], bots: list[str]) -> dict:
+    """Aggregate W/D/L per config, Elo and move latency percentiles."""
+    table: dict[str, dict[str, dict[str, int]]] = {}
+    latencies: dict[str, list[float]] = {bot: [] for bot in bots}
+
+    for r in results:
+        per_config = table.setdefault(r["config"], {})
+        for spec, sign, key in ((r["x"], 1, "x_ms"), (r["o"], -1, "o_ms")):
+            row = per_config.setdefault(spec, {"win": 0, "draw": 0, "loss": 0})
+            if r["winner"] == 0:
+                row["draw"] += 1
+            elif r["winner"] == sign:
+                row["win"] += 1
+            else:
+                row["loss"] += 1
+            latencies[spec].extend(r[key])
+
+    return {
+        "results": table,
+        "elo": estimate_elo(results, bots),
+        "latency_ms": {
+            bot: {f"p{p}": percentile(values, p) for p in PERCENTILES}
+            for bot, values in latencies.items()
+        },
+    }
+
+
+def print_summary(summary: dict, bots: list[str]) -> None:
+    width = max(len(bot) for bot in bots) + 2
+    for config, rows in summary["results"].items():
+        print(f"\n{config}")
+        print(f"{'bot':<{width}}{'win':>6}{'draw':>6}{'loss':>6}")
+        for bot in bots:
+            row = rows.get(bot, {"win": 0, "draw": 0, "loss": 0})
+            print(f"{bot:<{width}}{row['win']:>6}{row['draw']:>6}{row['loss']:>6}")
+
+    header = "".join(f"{'p' + str(p):>10}" for p in PERCENTILES)
+    print(f"\n{'bot':<{width}}{'elo':>8}{header}")
+    for bot in sorted(bots, key=lambda b: -summary["elo"][b]):
+        latency = summary["latency_ms"][bot]
+        print(
+            f"{bot:<{width}}{summary['elo'][bot]:>8.0f}"
+            + "".join(f"{latency[f'p{p}']:>8.1f}ms" for p in PERCENTILES)
+        )
+
+
+def _parse_config(text: str) -> tuple[int, int]:
+    size, _, win_length = text.partition(":")
+    return int(size), int(win_length or size)
+
+
+def main(argv: list[str] | None = None) -> None:
+    parser = argparse.ArgumentParser(description="Round-robin bot tournament.")
+    parser.add_argument("--bots", nargs="+", required=True, help="bot specs")
+    parser.add_argument(
+        "--configs", nargs="+", default=["3:3"], help="board configs 'size:win'"
+    )
+    parser.add_argument("--games", type=int, default=10, help="games per pairing")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", default=None, help="also write summary here")
+    args = parser.parse_args(argv)
+
+    bots = list(dict.fromkeys(args.bots))
+    if len(bots) < 2:
+        parser.error("need at least two different bots")
+    configs = [_parse_config(text) for text in args.configs]
+    tasks = build_tasks(bots, configs, args.games, args.seed)
+
+    started = time.perf_counter()
+    with ProcessPoolExecutor(
+        max_workers=args.workers, initializer=_quiet_worker
+    ) as pool:
+        # map keeps task order, so aggregation does not depend on scheduling
+        results = list(pool.map(play_match, tasks, chunksize=4))
+    logger.info(
+        f"Tournament: {len(results)} games in {time.perf_counter() - started:.1f}s "
+        f"on {args.workers} workers"
+    )
+    forfeits = Counter(r["forfeit"] for r in results if r["forfeit"] is not None)
+    for spec, count in forfeits.items():
+        logger.warning(
+            f"Tournament: {spec} forfeited {count} games without a legal move"
+        )
+
+    summary = summarize(results, bots)
+    print_summary(summary, bots)
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as fh:
+            json.dump(summary, fh, indent=2)
+
+
+if __name__ == "__main__":
+    main()
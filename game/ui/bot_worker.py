@@ -0,0 +1,102 @@
+import queue
+import threading
+
+import pygame
+
+from logger_config import logger
+
+# posted when the bot has chosen a move; attributes: move, request_id
+BOT_MOVE_EVENT = pygame.USEREVENT + 1
+
+
+class BotWorker:
+    """Runs bot searches on a background thread.
+
+    The main loop calls ``request_move`` and keeps rendering; the chosen move
+    comes back as a BOT_MOVE_EVENT. Only the latest request is current:
+    ``cancel`` stops the running search and makes its result stale.
+
+    The engine (``bot_factory()``) and the thread are only created by the
+    first request, so games without a bot never pay for loading solver
+    tables or starting worker pools.
+    """
+
+    def __init__(self, bot_factory):
+        self.bot = None
+        self._bot_factory = bot_factory
+        self._requests: queue.Queue = queue.Queue()
+        self._request_id = 0
+        self._pending: int | None = None
+        self._cancel = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    @property
+    def busy(self) -> bool:
+        """True while a requested move has not been delivered yet."""
+        return self._pending is not None
+
+    def request_move(self, board, player: int, win_length: int) -> int:
+        """Start thinking on a copy of board; return the request id."""
+        self.cancel()
+        if self._thread is None:
+            self.bot = self._bot_factory()
+            self._thread = threading.Thread(
+                target=self._run, name="bot-worker", daemon=True
+            )
+            self._thread.start()
+        self._request_id += 1
+        self._cancel = threading.Event()
+        self._pending = self._request_id
+        self._requests.put(
+            (self._request_id, board.copy(), player, win_length, self._cancel)
+        )
+        logger.debug("BotWorker: request {} started", self._request_id)
+        return self._request_id
+
+    def cancel(self) -> None:
+        """Stop the current search; its move will never be accepted."""
+        if self._pending is not None:
+            logger.debug("BotWorker: request {} cancelled", self._pending)
+        self._cancel.set()
+        self._pending = None
+
+    def accept(self, event) -> bool:
+        """Return True if a BOT_MOVE_EVENT answers the current request."""
+        if event.request_id != self._pending:
+            return False
+        self._pending = None
+        return True
+
+    def stop(self) -> None:
+        """Cancel any search, let the thread exit and release the bot."""
+        self.cancel()
+        if self._thread is None:
+            return
+        self._requests.put(None)
+        self._thread.join(timeout=1.0)
+        self.bot.close()
+
+    def _run(self) -> None:
+        while True:
+            item = self._requests.get()
+            if item is None:
+                return
+
+            request_id, board, player, win_length, cancel = item
+            if cancel.is_set():
+                continue
+
+            try:
+                move = self.bot.choose_move(
+                    board, player, win_length, should_stop=cancel.is_set
+                )
+            except Exception as exc:
+                logger.error(f"BotWorker: bot failed: {exc}")
+                move = None
+
+            if cancel.is_set():
+                continue
+
+            pygame.event.post(
+                pygame.event.Event(BOT_MOVE_EVENT, move=move, request_id=request_id)
+            )
@@ -17,7 +17,7 @@ def handle_event(event, win, state) -> None:
 
 def handle_mouse_click(pos, win, state) -> None:
     """Handle mouse click based on current game state."""
-    logger.debug(f"Mouse click at pos={pos}")
+    logger.debug("Mouse click at pos={}", pos)
 
     # If game has finished, any click inside board restarts the game
     if state.winner is not None:
@@ -45,7 +45,7 @@ def handle_mouse_click(pos, win, state) -> None:
     row = int(by // cell_size)
 
     if not (0 <= col < size and 0 <= row < size):
-        logger.debug(f"Click mapped out of range (row={row}, col={col}) -> ignored")
+        logger.debug("Click mapped out of range (row={}, col={}) -> ignored", row, col)
         return
 
     state.apply_move(row, col)
\ No newline at end of file
@@ -0,0 +1,35 @@
+# game/ui/dirty.py
+
+_MISSING = object()
+
+
+class DirtyTracker:
+    """
+    Remembers what every region of the base surface currently shows.
+
+    Draw functions call begin(scene) once per frame: it returns True when
+    the whole surface has to be redrawn (first frame, another screen or
+    invalidate()). changed(key, signature) returns True when a region must
+    be redrawn because its signature differs from the one drawn last time.
+    """
+
+    def __init__(self) -> None:
+        self._scene = _MISSING
+        self._signatures: dict = {}
+
+    def invalidate(self) -> None:
+        """Force a full redraw on the next frame."""
+        self._scene = _MISSING
+
+    def begin(self, scene) -> bool:
+        if scene == self._scene:
+            return False
+        self._scene = scene
+        self._signatures.clear()
+        return True
+
+    def changed(self, key, signature) -> bool:
+        if self._signatures.get(key, _MISSING) == signature:
+            return False
+        self._signatures[key] = signature
+        return True
@@ -0,0 +1,34 @@
+# game/ui/fonts.py
+from collections import OrderedDict
+
+import pygame
+
+# rendered labels kept for reuse; the screens show a few dozen at most
+TEXT_CACHE_SIZE = 256
+
+_fonts: dict[int, pygame.font.Font] = {}
+_texts: OrderedDict = OrderedDict()
+
+
+def get_font(size: int) -> pygame.font.Font:
+    """Return the shared default font of the given size (looked up once)."""
+    font = _fonts.get(size)
+    if font is None:
+        font = pygame.font.SysFont(None, size)
+        _fonts[size] = font
+    return font
+
+
+def render_text(text: str, size: int, color) -> pygame.Surface:
+    """Return an antialiased label, rendered once per (text, size, color)."""
+    key = (text, size, tuple(color))
+    label = _texts.get(key)
+    if label is not None:
+        _texts.move_to_end(key)
+        return label
+
+    label = get_font(size).render(text, True, color)
+    _texts[key] = label
+    if len(_texts) > TEXT_CACHE_SIZE:
+        _texts.popitem(last=False)
+    return label
@@ -0,0 +1,34 @@
+# game/ui/hit_index.py
+
+# side of one bucket in base surface pixels
+HIT_BUCKET_SIZE = 32
+
+
+class HitIndex:
+    """
+    Grid-bucket map from base surface points to named rects.
+
+    Every rect is registered in the buckets it overlaps, so hit() only
+    tests the few rects sharing the clicked bucket, however many controls
+    a screen has.
+    """
+
+    def __init__(self, rects: dict, bucket_size: int = HIT_BUCKET_SIZE) -> None:
+        self.bucket_size = bucket_size
+        self._buckets: dict[tuple[int, int], list] = {}
+        for key, rect in rects.items():
+            if rect.w <= 0 or rect.h <= 0:
+                continue
+            for bx in range(rect.left // bucket_size, (rect.right - 1) // bucket_size + 1):
+                for by in range(rect.top // bucket_size, (rect.bottom - 1) // bucket_size + 1):
+                    self._buckets.setdefault((bx, by), []).append((key, rect))
+
+    def hit(self, point):
+        """Return the key of the rect containing point, or None."""
+        x, y = point
+        bucket = self._buckets.get((int(x // self.bucket_size), int(y // self.bucket_size)))
+        if bucket:
+            for key, rect in bucket:
+                if rect.collidepoint(point):
+                    return key
+        return None
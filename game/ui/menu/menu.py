@@ -2,6 +2,9 @@ import pygame
 
 from config import BASE_SIZE, GRID_SIZE, FPS
 from logger_config import logger
+from ui.dirty import DirtyTracker
+from ui.fonts import render_text
+from ui.hit_index import HitIndex
 
 
 class MenuState:
@@ -10,16 +13,13 @@ class MenuState:
     def __init__(self) -> None:
         logger.debug("MenuState: initializing")
 
-        # theme-related
+        # theme-related; animated themes use SpriteAtlas images
         self.player_x_image = None
         self.player_o_image = None
         self.selected_theme_id = "classic"
         self.selected_theme_name = "Classic X/O"
-
-        # Animation (for animated themes)
-        self.animation_frames_x = []
-        self.animation_frames_o = []
-        self.animation_frame_duration_ms = 0
+        # (theme, image paths) while its images are decoded in the background
+        self.pending_theme = None
 
         # game options
         self.board_size = GRID_SIZE
@@ -29,7 +29,7 @@ class MenuState:
         # game mode flags
         self.vs_bot = None  # None = not chosen, False = vs player, True = vs bot
 
-        self.font = pygame.font.SysFont(None, 36)
+        self.font_size = 36
 
         button_width = int(BASE_SIZE * 0.7)
         button_height = 50
@@ -52,12 +52,13 @@ class MenuState:
                 x, top + 3 * (button_height + gap), button_width, button_height
             ),
         }
+        self.hit_index = HitIndex(self.buttons)
 
         logger.debug("MenuState: buttons initialized")
 
 
 def draw_button(surface: pygame.Surface, rect: pygame.Rect, text: str,
-                font: pygame.font.Font, active: bool = False) -> None:
+                font_size: int, active: bool = False) -> None:
     """Draw a simple rounded button."""
     bg = (120, 120, 120) if active else (90, 90, 90)
     border = (230, 230, 230)
@@ -66,38 +67,50 @@ def draw_button(surface: pygame.Surface, rect: pygame.Rect, text: str,
     pygame.draw.rect(surface, bg, rect, border_radius=10)
     pygame.draw.rect(surface, border, rect, width=2, border_radius=10)
 
-    label = font.render(text, True, text_color)
+    label = render_text(text, font_size, text_color)
     label_rect = label.get_rect(center=rect.center)
     surface.blit(label, label_rect)
 
 
-def draw_menu(surface: pygame.Surface, menu_state: MenuState) -> None:
+def draw_menu(surface: pygame.Surface, menu_state: MenuState,
+              tracker: DirtyTracker | None = None) -> list[pygame.Rect]:
+    """Draw the main menu; returns the changed regions of surface."""
     logger.trace("Menu: drawing menu frame")
 
-    surface.fill((20, 20, 20))
+    full = tracker is None or tracker.begin("menu")
+    if full:
+        surface.fill((20, 20, 20))
 
-    draw_button(surface, menu_state.buttons["vs_player"], "Play vs Player", menu_state.font)
-    draw_button(surface, menu_state.buttons["vs_bot"], "Play vs Bot", menu_state.font)
-    draw_button(surface, menu_state.buttons["options"], "Options", menu_state.font)
-    draw_button(surface, menu_state.buttons["themes"], "Themes", menu_state.font)
+        draw_button(surface, menu_state.buttons["vs_player"], "Play vs Player", menu_state.font_size)
+        draw_button(surface, menu_state.buttons["vs_bot"], "Play vs Bot", menu_state.font_size)
+        draw_button(surface, menu_state.buttons["options"], "Options", menu_state.font_size)
+        draw_button(surface, menu_state.buttons["themes"], "Themes", menu_state.font_size)
 
     # info block under last button
-    info_font = pygame.font.SysFont(None, 24)
     info_lines = [
         f"Board: {menu_state.board_size}x{menu_state.board_size}",
         f"Win length: {menu_state.win_length}",
         f"FPS: {menu_state.fps}",
-        f"Theme: {menu_state.selected_theme_name}",
+        f"Theme: {menu_state.selected_theme_name}"
+        + (" (loading...)" if menu_state.pending_theme else ""),
     ]
+    if tracker is not None and not tracker.changed("info", info_lines):
+        return []
 
     last_rect = menu_state.buttons["themes"]
+    info_top = last_rect.bottom + 1
+    info_rect = pygame.Rect(0, info_top, BASE_SIZE, BASE_SIZE - info_top)
+    surface.fill((20, 20, 20), info_rect)
+
     y = last_rect.bottom + 10
     for line in info_lines:
-        label = info_font.render(line, True, (230, 230, 230))
+        label = render_text(line, 24, (230, 230, 230))
         rect = label.get_rect(center=(BASE_SIZE // 2, y))
         surface.blit(label, rect)
         y += label.get_height() + 2
 
+    return [surface.get_rect()] if full else [info_rect]
+
 
 def handle_menu_event(event, win, menu_state: MenuState, mode: str, state) -> str:
     """Process input in main menu. Returns new mode."""
@@ -116,23 +129,23 @@ def handle_menu_event(event, win, menu_state: MenuState, mode: str, state) -> st
         logger.debug("Menu: click outside board")
         return mode
 
-    point = (bx, by)
+    key = menu_state.hit_index.hit((bx, by))
 
-    if menu_state.buttons["vs_player"].collidepoint(point):
+    if key == "vs_player":
         logger.info("Menu: switching to 'Player vs Player' mode")
         menu_state.vs_bot = False
         return "game"
 
-    if menu_state.buttons["vs_bot"].collidepoint(point):
+    if key == "vs_bot":
         logger.info("Menu: switching to 'Player vs Bot' mode")
         menu_state.vs_bot = True
         return "game"
 
-    if menu_state.buttons["options"].collidepoint(point):
+    if key == "options":
         logger.info("Menu: switching to 'Options' screen")
         return "options"
 
-    if menu_state.buttons["themes"].collidepoint(point):
+    if key == "themes":
         logger.info("Menu: switching to 'Themes' screen")
         return "themes"
 
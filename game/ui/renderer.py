@@ -1,3 +1,5 @@
+from collections import OrderedDict
+
 import pygame
 
 from config import (
@@ -9,6 +11,16 @@ from config import (
     LINE_WIDTH,
     MARK_WIDTH,
 )
+from themes.atlas import SpriteAtlas
+from ui.dirty import DirtyTracker
+
+# pre-rendered background + grid per (board size, surface size);
+# the grid only changes when the board size does
+_grid_layers: dict[tuple[int, tuple[int, int]], pygame.Surface] = {}
+
+# theme images scaled to a cell: (id(image), cell_size) -> (image, scaled)
+SCALED_IMAGE_CACHE_SIZE = 64
+_scaled_images: OrderedDict = OrderedDict()
 
 
 def _cell_size_from_board(board) -> int:
@@ -24,6 +36,7 @@ def _scale_image_to_cell(image: pygame.Surface, cell_size: int) -> pygame.Surfac
     Scale image to fit inside a single cell without overlapping grid lines.
 
     Keeps aspect ratio and leaves a small padding from the grid lines.
+    A SpriteAtlas is scaled frame by frame into a new atlas.
     """
     if image is None:
         return image
@@ -32,7 +45,8 @@ def _scale_image_to_cell(image: pygame.Surface, cell_size: int) -> pygame.Surfac
     inner_size = cell_size - 2 * LINE_WIDTH
     inner_size = max(inner_size - 2, 1)
 
-    src_w, src_h = image.get_size()
+    animated = isinstance(image, SpriteAtlas)
+    src_w, src_h = image.frame_size if animated else image.get_size()
     if src_w <= 0 or src_h <= 0:
         return image
 
@@ -40,9 +54,33 @@ def _scale_image_to_cell(image: pygame.Surface, cell_size: int) -> pygame.Surfac
     target_w = max(int(src_w * scale), 1)
     target_h = max(int(src_h * scale), 1)
 
+    if animated:
+        return image.scaled((target_w, target_h))
     return pygame.transform.smoothscale(image, (target_w, target_h))
 
 
+def _scaled_image(image: pygame.Surface, cell_size: int) -> pygame.Surface:
+    """Return image scaled to cell_size, from the LRU cache when possible."""
+    key = (id(image), cell_size)
+    entry = _scaled_images.get(key)
+    # the entry keeps its image alive, but check identity all the same
+    if entry is not None and entry[0] is image:
+        _scaled_images.move_to_end(key)
+        return entry[1]
+
+    scaled = _scale_image_to_cell(image, cell_size)
+    _scaled_images[key] = (image, scaled)
+    _scaled_images.move_to_end(key)
+    if len(_scaled_images) > SCALED_IMAGE_CACHE_SIZE:
+        _scaled_images.popitem(last=False)
+    return scaled
+
+
+def clear_scaled_images() -> None:
+    """Forget scaled theme images, e.g. when a theme replaces its images."""
+    _scaled_images.clear()
+
+
 def draw_grid(surface: pygame.Surface, board) -> None:
     """Draw grid lines on the base surface for the given board."""
     size = len(board)
@@ -61,29 +99,93 @@ def draw_grid(surface: pygame.Surface, board) -> None:
         y += cell_size
 
 
+def _grid_layer(surface: pygame.Surface, board) -> pygame.Surface:
+    """Return the cached background + grid layer matching surface and board."""
+    key = (len(board), surface.get_size())
+    layer = _grid_layers.get(key)
+    if layer is None:
+        # same pixel format as the target, so blitting needs no conversion
+        layer = pygame.Surface(surface.get_size(), 0, surface)
+        layer.fill(BG_COLOR)
+        draw_grid(layer, board)
+        _grid_layers[key] = layer
+    return layer
+
+
+def _sprite(image, cell_size: int, time_ms: int):
+    """(surface, area) to blit for a theme image, area is None unless animated."""
+    if image is None:
+        return None
+    scaled = _scaled_image(image, cell_size)
+    if isinstance(scaled, SpriteAtlas):
+        return scaled.surface, scaled.rects[scaled.frame_at(time_ms)]
+    return scaled, None
+
+
+def _draw_mark(
+    surface: pygame.Surface,
+    value: int,
+    cx: int,
+    cy: int,
+    cell_size: int,
+    sprite_x,
+    sprite_o,
+) -> None:
+    """Draw one mark centered at (cx, cy); sprites come from _sprite()."""
+    sprite = sprite_x if value == 1 else sprite_o
+    if value != 0 and sprite is not None:
+        image, area = sprite
+        rect = pygame.Rect((0, 0), area.size if area else image.get_size())
+        rect.center = (cx, cy)
+        surface.blit(image, rect, area)
+    elif value == 1:
+        # Player X
+        offset = cell_size // 3
+        pygame.draw.line(
+            surface,
+            X_COLOR,
+            (cx - offset, cy - offset),
+            (cx + offset, cy + offset),
+            MARK_WIDTH,
+        )
+        pygame.draw.line(
+            surface,
+            X_COLOR,
+            (cx - offset, cy + offset),
+            (cx + offset, cy - offset),
+            MARK_WIDTH,
+        )
+    elif value == -1:
+        # Player O
+        radius = cell_size // 3
+        pygame.draw.circle(
+            surface,
+            O_COLOR,
+            (cx, cy),
+            radius,
+            MARK_WIDTH,
+        )
+
+
 def draw_marks(
     surface: pygame.Surface,
     board,
-    player_x_image: pygame.Surface | None = None,
-    player_o_image: pygame.Surface | None = None,
+    player_x_image=None,
+    player_o_image=None,
+    time_ms: int = 0,
 ) -> None:
     """
     Draw marks on the board.
 
     If player_x_image / player_o_image are provided, they are scaled
-    to fit current cell size for any board dimension.
+    to fit current cell size for any board dimension. They may be
+    SpriteAtlas animations; time_ms selects the frame.
     """
     size = len(board)
     cell_size = _cell_size_from_board(board)
 
-    scaled_x: pygame.Surface | None = None
-    scaled_o: pygame.Surface | None = None
-
-    if player_x_image is not None:
-        scaled_x = _scale_image_to_cell(player_x_image, cell_size)
-
-    if player_o_image is not None:
-        scaled_o = _scale_image_to_cell(player_o_image, cell_size)
+    sprite_x = _sprite(player_x_image, cell_size, time_ms)
+    sprite_o = _sprite(player_o_image, cell_size, time_ms)
 
     for row in range(size):
         for col in range(size):
@@ -93,51 +195,83 @@ def draw_marks(
 
             cx = col * cell_size + cell_size // 2
             cy = row * cell_size + cell_size // 2
-
-            if value == 1:
-                # Player X
-                if scaled_x is not None:
-                    rect = scaled_x.get_rect(center=(cx, cy))
-                    surface.blit(scaled_x, rect)
-                else:
-                    offset = cell_size // 3
-                    pygame.draw.line(
-                        surface,
-                        X_COLOR,
-                        (cx - offset, cy - offset),
-                        (cx + offset, cy + offset),
-                        MARK_WIDTH,
-                    )
-                    pygame.draw.line(
-                        surface,
-                        X_COLOR,
-                        (cx - offset, cy + offset),
-                        (cx + offset, cy - offset),
-                        MARK_WIDTH,
-                    )
-            elif value == -1:
-                # Player O
-                if scaled_o is not None:
-                    rect = scaled_o.get_rect(center=(cx, cy))
-                    surface.blit(scaled_o, rect)
-                else:
-                    radius = cell_size // 3
-                    pygame.draw.circle(
-                        surface,
-                        O_COLOR,
-                        (cx, cy),
-                        radius,
-                        MARK_WIDTH,
-                    )
+            _draw_mark(surface, value, cx, cy, cell_size, sprite_x, sprite_o)
 
 
 def draw_all(
     surface: pygame.Surface,
     board,
-    player_x_image: pygame.Surface | None = None,
-    player_o_image: pygame.Surface | None = None,
-) -> None:
-    """Draw full board: background, grid and marks."""
-    surface.fill(BG_COLOR)
-    draw_grid(surface, board)
-    draw_marks(surface, board, player_x_image, player_o_image)
+    player_x_image=None,
+    player_o_image=None,
+    tracker: DirtyTracker | None = None,
+    time_ms: int = 0,
+) -> list[pygame.Rect]:
+    """
+    Draw full board: cached background and grid, then marks on top.
+
+    With a tracker only cells whose mark, mark image or animation frame
+    changed since the previous frame are redrawn. Returns the changed
+    regions of surface.
+    """
+    layer = _grid_layer(surface, board)
+    size = len(board)
+    full = tracker is None or tracker.begin(("game", size, surface.get_size()))
+    if full:
+        surface.blit(layer, (0, 0))
+        draw_marks(surface, board, player_x_image, player_o_image, time_ms)
+        if tracker is None:
+            return [surface.get_rect()]
+
+    changed = []
+    for row in range(size):
+        for col in range(size):
+            value = board[row][col]
+            signature = _mark_signature(value, player_x_image, player_o_image, time_ms)
+            if tracker.changed((row, col), signature):
+                changed.append((row, col, value))
+    if full:
+        return [surface.get_rect()]
+    if not changed:
+        return []
+
+    cell_size = _cell_size_from_board(board)
+    sprite_x = _sprite(player_x_image, cell_size, time_ms)
+    sprite_o = _sprite(player_o_image, cell_size, time_ms)
+
+    dirty = []
+    clip = surface.get_clip()
+    for row, col, value in changed:
+        # the whole cell is restored: on large boards the builtin marks
+        # reach past the grid line inset; clipping keeps a mark out of
+        # its neighbours, which are not redrawn
+        rect = pygame.Rect(col * cell_size, row * cell_size, cell_size, cell_size)
+        surface.set_clip(rect)
+        surface.blit(layer, rect, rect)
+        _draw_mark(
+            surface, value, rect.centerx, rect.centery, cell_size, sprite_x, sprite_o
+        )
+        dirty.append(rect)
+    surface.set_clip(clip)
+    return dirty
+
+
+def _mark_signature(value: int, player_x_image, player_o_image, time_ms: int):
+    """What a cell shows: its value, the theme image and the animation frame."""
+    if value == 1:
+        image = player_x_image
+    elif value == -1:
+        image = player_o_image
+    else:
+        return value, None, 0
+    frame = image.frame_at(time_ms) if isinstance(image, SpriteAtlas) else 0
+    return value, image, frame
+
+
+def next_frame_in(player_x_image, player_o_image, time_ms: int) -> int | None:
+    """Milliseconds until an animated mark image changes frame, None if static."""
+    waits = [
+        image.next_change_in(time_ms)
+        for image in (player_x_image, player_o_image)
+        if isinstance(image, SpriteAtlas)
+    ]
+    return min(waits) if waits else None
@@ -3,18 +3,22 @@
 from ui.renderer import draw_all
 
 
-def draw_game(surface, state, menu_state) -> None:
+def draw_game(surface, state, menu_state, tracker=None):
     """
     Draw the main game screen using current game and menu state.
 
     surface    - pygame Surface to render on
     state      - GameState instance
     menu_state - MenuState instance (contains selected images)
+    tracker    - optional DirtyTracker, redraw only what changed
+
+    Returns the changed regions of surface.
     """
     board_matrix = state.board.data
-    draw_all(
+    return draw_all(
         surface,
         board_matrix,
         menu_state.player_x_image,
         menu_state.player_o_image,
+        tracker,
     )
\ No newline at end of file
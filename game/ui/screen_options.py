@@ -1,7 +1,12 @@
+from functools import lru_cache
+
 import pygame
 
 from config import BASE_SIZE
 from logger_config import logger
+from ui.dirty import DirtyTracker
+from ui.fonts import render_text
+from ui.hit_index import HitIndex
 
 MIN_BOARD_SIZE = 3
 MAX_BOARD_SIZE = 10
@@ -11,6 +16,16 @@ MIN_FPS = 30
 MAX_FPS = 240
 FPS_STEP = 10
 
+# clickable control -> (menu_state attribute, step)
+_ADJUSTMENTS = {
+    "board_minus": ("board_size", -1),
+    "board_plus": ("board_size", 1),
+    "win_minus": ("win_length", -1),
+    "win_plus": ("win_length", 1),
+    "fps_minus": ("fps", -FPS_STEP),
+    "fps_plus": ("fps", FPS_STEP),
+}
+
 
 def _build_controls():
     button_width = int(BASE_SIZE * 0.9)
@@ -48,6 +63,14 @@ def _build_controls():
     return controls
 
 
+@lru_cache(maxsize=1)
+def _layout():
+    """Controls and hit index of the options screen; the layout is fixed."""
+    controls = _build_controls()
+    buttons = {key: rect for key, rect in controls.items() if not key.endswith("_label")}
+    return controls, HitIndex(buttons)
+
+
 def _ensure_limits(menu_state) -> None:
     if menu_state.board_size < MIN_BOARD_SIZE:
         menu_state.board_size = MIN_BOARD_SIZE
@@ -65,68 +88,53 @@ def _ensure_limits(menu_state) -> None:
         menu_state.fps = MAX_FPS
 
 
-def draw_options(surface: pygame.Surface, menu_state) -> None:
+def draw_options(surface: pygame.Surface, menu_state,
+                 tracker: DirtyTracker | None = None) -> list[pygame.Rect]:
+    """Draw the options screen; returns the changed regions of surface."""
     logger.trace("Options: drawing options screen")
 
-    surface.fill((15, 15, 15))
-
-    title_font = pygame.font.SysFont(None, 40)
-    font = pygame.font.SysFont(None, 30)
-
-    title = title_font.render("Settings", True, (230, 230, 230))
-    title_rect = title.get_rect(center=(BASE_SIZE // 2, 40))
-    surface.blit(title, title_rect)
-
-    controls = _build_controls()
-
-    minus_label = font.render("-", True, (230, 230, 230))
-    plus_label = font.render("+", True, (230, 230, 230))
-
-    # board size
-    pygame.draw.rect(surface, (80, 80, 80), controls["board_minus"], border_radius=8)
-    pygame.draw.rect(surface, (200, 200, 200), controls["board_minus"], width=2, border_radius=8)
-    surface.blit(minus_label, minus_label.get_rect(center=controls["board_minus"].center))
-
-    pygame.draw.rect(surface, (80, 80, 80), controls["board_plus"], border_radius=8)
-    pygame.draw.rect(surface, (200, 200, 200), controls["board_plus"], width=2, border_radius=8)
-    surface.blit(plus_label, plus_label.get_rect(center=controls["board_plus"].center))
-
-    text = f"Board size: {menu_state.board_size}x{menu_state.board_size}"
-    lbl = font.render(text, True, (230, 230, 230))
-    surface.blit(lbl, lbl.get_rect(center=controls["board_label"].center))
-
-    # win length
-    pygame.draw.rect(surface, (80, 80, 80), controls["win_minus"], border_radius=8)
-    pygame.draw.rect(surface, (200, 200, 200), controls["win_minus"], width=2, border_radius=8)
-    surface.blit(minus_label, minus_label.get_rect(center=controls["win_minus"].center))
-
-    pygame.draw.rect(surface, (80, 80, 80), controls["win_plus"], border_radius=8)
-    pygame.draw.rect(surface, (200, 200, 200), controls["win_plus"], width=2, border_radius=8)
-    surface.blit(plus_label, plus_label.get_rect(center=controls["win_plus"].center))
-
-    text = f"Win length: {menu_state.win_length}"
-    lbl = font.render(text, True, (230, 230, 230))
-    surface.blit(lbl, lbl.get_rect(center=controls["win_label"].center))
-
-    # fps
-    pygame.draw.rect(surface, (80, 80, 80), controls["fps_minus"], border_radius=8)
-    pygame.draw.rect(surface, (200, 200, 200), controls["fps_minus"], width=2, border_radius=8)
-    surface.blit(minus_label, minus_label.get_rect(center=controls["fps_minus"].center))
-
-    pygame.draw.rect(surface, (80, 80, 80), controls["fps_plus"], border_radius=8)
-    pygame.draw.rect(surface, (200, 200, 200), controls["fps_plus"], width=2, border_radius=8)
-    surface.blit(plus_label, plus_label.get_rect(center=controls["fps_plus"].center))
-
-    text = f"FPS: {menu_state.fps}"
-    lbl = font.render(text, True, (230, 230, 230))
-    surface.blit(lbl, lbl.get_rect(center=controls["fps_label"].center))
-
-    # back
-    back_rect = controls["back"]
-    pygame.draw.rect(surface, (90, 90, 90), back_rect, border_radius=8)
-    pygame.draw.rect(surface, (220, 220, 220), back_rect, width=2, border_radius=8)
-    back_label = font.render("Back", True, (230, 230, 230))
-    surface.blit(back_label, back_label.get_rect(center=back_rect.center))
+    controls, _ = _layout()
+
+    full = tracker is None or tracker.begin("options")
+    if full:
+        surface.fill((15, 15, 15))
+
+        title = render_text("Settings", 40, (230, 230, 230))
+        title_rect = title.get_rect(center=(BASE_SIZE // 2, 40))
+        surface.blit(title, title_rect)
+
+        minus_label = render_text("-", 30, (230, 230, 230))
+        plus_label = render_text("+", 30, (230, 230, 230))
+
+        for prefix in ("board", "win", "fps"):
+            for key, label in ((f"{prefix}_minus", minus_label), (f"{prefix}_plus", plus_label)):
+                pygame.draw.rect(surface, (80, 80, 80), controls[key], border_radius=8)
+                pygame.draw.rect(surface, (200, 200, 200), controls[key], width=2, border_radius=8)
+                surface.blit(label, label.get_rect(center=controls[key].center))
+
+        # back
+        back_rect = controls["back"]
+        pygame.draw.rect(surface, (90, 90, 90), back_rect, border_radius=8)
+        pygame.draw.rect(surface, (220, 220, 220), back_rect, width=2, border_radius=8)
+        back_label = render_text("Back", 30, (230, 230, 230))
+        surface.blit(back_label, back_label.get_rect(center=back_rect.center))
+
+    # values: the only part that changes while the screen is shown
+    dirty = []
+    for key, text in (
+        ("board_label", f"Board size: {menu_state.board_size}x{menu_state.board_size}"),
+        ("win_label", f"Win length: {menu_state.win_length}"),
+        ("fps_label", f"FPS: {menu_state.fps}"),
+    ):
+        if tracker is not None and not tracker.changed(key, text):
+            continue
+        rect = controls[key]
+        surface.fill((15, 15, 15), rect)
+        lbl = render_text(text, 30, (230, 230, 230))
+        surface.blit(lbl, lbl.get_rect(center=rect.center))
+        dirty.append(rect)
+
+    return [surface.get_rect()] if full else dirty
 
 
 def handle_options_event(event, win, menu_state, mode: str, state) -> str:
@@ -144,46 +152,17 @@ def handle_options_event(event, win, menu_state, mode: str, state) -> str:
     if not inside:
         return mode
 
-    controls = _build_controls()
-    point = (bx, by)
-
-    if controls["board_minus"].collidepoint(point):
-        menu_state.board_size -= 1
-        _ensure_limits(menu_state)
-        logger.debug(f"Options: board_size -> {menu_state.board_size}")
-        return mode
-
-    if controls["board_plus"].collidepoint(point):
-        menu_state.board_size += 1
-        _ensure_limits(menu_state)
-        logger.debug(f"Options: board_size -> {menu_state.board_size}")
-        return mode
-
-    if controls["win_minus"].collidepoint(point):
-        menu_state.win_length -= 1
-        _ensure_limits(menu_state)
-        logger.debug(f"Options: win_length -> {menu_state.win_length}")
-        return mode
-
-    if controls["win_plus"].collidepoint(point):
-        menu_state.win_length += 1
-        _ensure_limits(menu_state)
-        logger.debug(f"Options: win_length -> {menu_state.win_length}")
-        return mode
-
-    if controls["fps_minus"].collidepoint(point):
-        menu_state.fps -= FPS_STEP
-        _ensure_limits(menu_state)
-        logger.debug(f"Options: fps -> {menu_state.fps}")
-        return mode
+    _, hit_index = _layout()
+    key = hit_index.hit((bx, by))
 
-    if controls["fps_plus"].collidepoint(point):
-        menu_state.fps += FPS_STEP
+    if key in _ADJUSTMENTS:
+        attr, step = _ADJUSTMENTS[key]
+        setattr(menu_state, attr, getattr(menu_state, attr) + step)
         _ensure_limits(menu_state)
-        logger.debug(f"Options: fps -> {menu_state.fps}")
+        logger.debug("Options: {} -> {}", attr, getattr(menu_state, attr))
         return mode
 
-    if controls["back"].collidepoint(point):
+    if key == "back":
         logger.info("Options: back to main menu")
         return "menu"
 
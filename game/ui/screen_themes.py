@@ -1,7 +1,12 @@
+from functools import lru_cache
+
 import pygame
 
 from config import BASE_SIZE
 from logger_config import logger
+from ui.dirty import DirtyTracker
+from ui.fonts import render_text
+from ui.hit_index import HitIndex
 from themes.theme_loader import apply_theme, ThemeDict
 
 
@@ -26,37 +31,61 @@ def _theme_rects(themes: list[ThemeDict]):
     return rects, back_rect
 
 
-def draw_themes(surface: pygame.Surface, menu_state, themes: list[ThemeDict]) -> None:
+@lru_cache(maxsize=4)
+def _layout(theme_count: int):
+    """Theme buttons, back button and their hit index for a list length.
+
+    The geometry depends only on how many themes there are, so a changed
+    theme list gets a new layout and an unchanged one reuses the cached.
+    """
+    rects, back_rect = _theme_rects([None] * theme_count)
+    targets = dict(enumerate(rects))
+    targets["back"] = back_rect
+    return rects, back_rect, HitIndex(targets)
+
+
+def draw_themes(surface: pygame.Surface, menu_state, themes: list[ThemeDict],
+                tracker: DirtyTracker | None = None) -> list[pygame.Rect]:
+    """Draw the themes screen; returns the changed regions of surface."""
     logger.trace("Themes: drawing themes screen")
 
-    surface.fill((15, 15, 15))
+    rects, back_rect, _ = _layout(len(themes))
 
-    title_font = pygame.font.SysFont(None, 40)
-    font = pygame.font.SysFont(None, 28)
+    full = tracker is None or tracker.begin(("themes", len(themes)))
+    if full:
+        surface.fill((15, 15, 15))
 
-    title = title_font.render("Themes", True, (230, 230, 230))
-    title_rect = title.get_rect(center=(BASE_SIZE // 2, 40))
-    surface.blit(title, title_rect)
+        title = render_text("Themes", 40, (230, 230, 230))
+        title_rect = title.get_rect(center=(BASE_SIZE // 2, 40))
+        surface.blit(title, title_rect)
 
-    rects, back_rect = _theme_rects(themes)
+        # back button
+        pygame.draw.rect(surface, (90, 90, 90), back_rect, border_radius=8)
+        pygame.draw.rect(surface, (220, 220, 220), back_rect, width=2, border_radius=8)
+        back_label = render_text("Back", 28, (230, 230, 230))
+        surface.blit(back_label, back_label.get_rect(center=back_rect.center))
 
+    dirty = []
     for rect, theme in zip(rects, themes):
         is_active = theme.get("id") == getattr(menu_state, "selected_theme_id", "classic")
+        name = theme.get("name", theme.get("id", "theme"))
+        if tracker is not None and not tracker.changed(rect.topleft, (name, is_active)):
+            continue
+
         bg = (110, 110, 110) if is_active else (70, 70, 70)
         border = (230, 230, 230) if is_active else (150, 150, 150)
 
+        # region border lies in the plain background, not on the button border
+        area = rect.inflate(4, 4)
+        surface.fill((15, 15, 15), area)
         pygame.draw.rect(surface, bg, rect, border_radius=8)
         pygame.draw.rect(surface, border, rect, width=2, border_radius=8)
 
-        name = theme.get("name", theme.get("id", "theme"))
-        label = font.render(name, True, (230, 230, 230))
+        label = render_text(name, 28, (230, 230, 230))
         surface.blit(label, label.get_rect(center=rect.center))
+        dirty.append(area)
 
-    # back button
-    pygame.draw.rect(surface, (90, 90, 90), back_rect, border_radius=8)
-    pygame.draw.rect(surface, (220, 220, 220), back_rect, width=2, border_radius=8)
-    back_label = font.render("Back", True, (230, 230, 230))
-    surface.blit(back_label, back_label.get_rect(center=back_rect.center))
+    return [surface.get_rect()] if full else dirty
 
 
 def handle_themes_event(event, win, menu_state, mode: str, state,
@@ -75,17 +104,16 @@ def handle_themes_event(event, win, menu_state, mode: str, state,
     if not inside:
         return mode
 
-    rects, back_rect = _theme_rects(themes)
-    point = (bx, by)
-
-    for rect, theme in zip(rects, themes):
-        if rect.collidepoint(point):
-            apply_theme(menu_state, theme)
-            logger.info(f"Themes: selected theme -> {menu_state.selected_theme_id}")
-            return "menu"
+    _, _, hit_index = _layout(len(themes))
+    key = hit_index.hit((bx, by))
 
-    if back_rect.collidepoint(point):
+    if key == "back":
         logger.info("Themes: back to main menu")
         return "menu"
 
+    if key is not None:
+        apply_theme(menu_state, themes[key])
+        logger.info(f"Themes: selected theme -> {menu_state.selected_theme_id}")
+        return "menu"
+
     return mode
@@ -1,5 +1,11 @@
+import math
+
 import pygame
 from config import BASE_SIZE, BG_COLOR
+from ui.dirty import DirtyTracker
+
+# extra base pixels scaled around a dirty rect
+_SCALE_MARGIN = 2
 
 
 class WindowManager:
@@ -13,36 +19,128 @@ class WindowManager:
 
         self.base_surface = pygame.Surface((BASE_SIZE, BASE_SIZE))
 
+        # what the draw functions last put on base_surface
+        self.dirty = DirtyTracker()
+
+        # base_surface scaled to the window, reused until the window resizes
+        self._scaled = None
+        # window size of the last present(); None forces a full update
+        self._presented_size = None
+
 
     def get_window_size(self):
         return self.screen.get_size()
 
 
+    def _viewport(self):
+        """Return (side, ox, oy) of the centered square the board is shown in."""
+        win_w, win_h = self.get_window_size()
+        side = min(win_w, win_h)
+        return side, (win_w - side) // 2, (win_h - side) // 2
+
+
     def clear(self):
         self.screen.fill(BG_COLOR)
 
 
-    def blit_scaled_centered(self):
-        win_w, win_h = self.get_window_size()
-        side = min(win_w, win_h)
+    def on_resize(self):
+        """Drop the scaled surface; called on VIDEORESIZE."""
+        self._scaled = None
+        self._presented_size = None
 
-        scaled = pygame.transform.smoothscale(
-            self.base_surface, (side, side)
-        )
 
-        ox = (win_w - side) // 2
-        oy = (win_h - side) // 2
+    def _rescale(self, side):
+        if self._scaled is None or self._scaled.get_width() != side:
+            # preallocated once per window size, smoothscale writes into it
+            self._scaled = pygame.Surface((side, side), 0, self.base_surface)
+        pygame.transform.smoothscale(self.base_surface, (side, side), self._scaled)
+
 
-        self.screen.blit(scaled, (ox, oy))
+    def blit_scaled_centered(self):
+        side, ox, oy = self._viewport()
+        if self._scaled is None or self._scaled.get_width() != side:
+            self._rescale(side)
+        self.screen.blit(self._scaled, (ox, oy))
+
+
+    def invalidate(self):
+        """Show the whole base surface again on the next present()."""
+        self._presented_size = None
+
+
+    def present(self, dirty_rects):
+        """
+        Show changed regions of the base surface in the window.
+
+        dirty_rects are in base surface coordinates. Only those regions are
+        rescaled into the cached window-sized surface and sent to the
+        display; nothing is scaled when the list is empty. The whole window
+        is updated after a resize or an invalidate().
+        """
+        size = self.get_window_size()
+        side, ox, oy = self._viewport()
+        base_rect = self.base_surface.get_rect()
+
+        if (
+            self._scaled is None
+            or self._scaled.get_width() != side
+            or base_rect in dirty_rects
+        ):
+            self._rescale(side)
+            changed = [self._scaled.get_rect()]
+        else:
+            changed = self._rescale_regions(dirty_rects, side)
+
+        if size != self._presented_size:
+            self._presented_size = size
+            self.clear()
+            self.screen.blit(self._scaled, (ox, oy))
+            pygame.display.flip()
+            return
+
+        if not changed:
+            return
+
+        updated = [
+            self.screen.blit(self._scaled, (ox + area.x, oy + area.y), area)
+            for area in changed
+        ]
+        pygame.display.update(updated)
+
+
+    def _rescale_regions(self, dirty_rects, side):
+        """Update parts of the scaled surface; return the areas written."""
+        base_rect = self.base_surface.get_rect()
+        scale = side / BASE_SIZE
+
+        changed = []
+        for rect in dirty_rects:
+            # scale a slightly larger area at the window scale and keep the
+            # middle, so filtering at the edges matches the full-frame scale
+            rect = rect.clip(base_rect)
+            if not rect.w or not rect.h:
+                continue
+            source = rect.inflate(2 * _SCALE_MARGIN, 2 * _SCALE_MARGIN).clip(base_rect)
+
+            scaled = pygame.transform.smoothscale(
+                self.base_surface.subsurface(source),
+                (round(source.w * scale), round(source.h * scale)),
+            )
+            left = math.floor(rect.left * scale)
+            top = math.floor(rect.top * scale)
+            area = pygame.Rect(
+                left - round(source.left * scale),
+                top - round(source.top * scale),
+                math.ceil(rect.right * scale) - left,
+                math.ceil(rect.bottom * scale) - top,
+            )
+            changed.append(self._scaled.blit(scaled, (left, top), area))
+        return changed
 
 
     def map_window_to_board(self, pos):
         wx, wy = pos
-        win_w, win_h = self.get_window_size()
-
-        side = min(win_w, win_h)
-        ox = (win_w - side) // 2
-        oy = (win_h - side) // 2
+        side, ox, oy = self._viewport()
 
         if not (ox <= wx < ox + side and oy <= wy < oy + side):
             return False, 0, 0
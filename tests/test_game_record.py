@@ -0,0 +1,112 @@
+import pytest
+
+from model.game_record import GameRecord, GameRecordWriter, read_records
+from model.game_state import GameState
+
+
+def _fields(record: GameRecord) -> tuple:
+    return record.board_size, record.win_length, record.result, record.moves
+
+
+def _write(path, records) -> None:
+    with GameRecordWriter(path) as writer:
+        for record in records:
+            writer.write(record)
+
+
+RECORDS = [
+    GameRecord(3, 3, 1, bytes([4, 0, 2, 6, 8, 1, 5])),
+    GameRecord(3, 3, 0, bytes([4, 0, 8, 2, 1, 7, 6, 3, 5])),
+    GameRecord(5, 4, -1, bytes([0, 12, 1, 13, 2, 14, 20, 11])),
+    GameRecord(15, 5, None, bytes([224, 112])),
+    GameRecord(4, 3, None, b""),
+]
+
+
+def test_round_trip(tmp_path):
+    path = tmp_path / "games.ttr"
+    _write(path, RECORDS)
+
+    assert [_fields(r) for r in read_records(path)] == [_fields(r) for r in RECORDS]
+
+
+def test_writer_appends_to_an_existing_file(tmp_path):
+    path = tmp_path / "games.ttr"
+    _write(path, RECORDS[:2])
+    _write(path, RECORDS[2:])
+
+    assert [_fields(r) for r in read_records(path)] == [_fields(r) for r in RECORDS]
+
+
+def test_record_from_state(tmp_path):
+    state = GameState(3, 3)
+    for row, col in ((1, 1), (0, 0), (0, 2), (2, 0), (2, 2), (1, 0)):
+        state.apply_move(row, col)
+    assert state.winner == -1
+
+    path = tmp_path / "games.ttr"
+    _write(path, [GameRecord.from_state(state)])
+
+    [record] = read_records(path)
+    assert _fields(record) == (3, 3, -1, bytes([4, 0, 2, 6, 8, 3]))
+
+
+def test_board_too_large_for_a_record():
+    with pytest.raises(ValueError):
+        GameRecord(16, 5, None, b"").encode()
+
+
+def test_truncated_tail_is_skipped_by_the_reader(tmp_path):
+    path = tmp_path / "games.ttr"
+    _write(path, RECORDS[:2])
+    complete = path.stat().st_size
+    with open(path, "ab") as fh:
+        fh.write(RECORDS[2].encode()[:-3])
+
+    assert [_fields(r) for r in read_records(path)] == [_fields(r) for r in RECORDS[:2]]
+    assert path.stat().st_size > complete
+
+
+def test_truncated_header_is_skipped_by_the_reader(tmp_path):
+    path = tmp_path / "games.ttr"
+    _write(path, RECORDS[:1])
+    with open(path, "ab") as fh:
+        fh.write(RECORDS[1].encode()[:2])
+
+    assert [_fields(r) for r in read_records(path)] == [_fields(RECORDS[0])]
+
+
+def test_writer_drops_a_truncated_tail(tmp_path):
+    path = tmp_path / "games.ttr"
+    _write(path, RECORDS[:2])
+    complete = path.stat().st_size
+    with open(path, "ab") as fh:
+        fh.write(RECORDS[2].encode()[:-3])
+
+    _write(path, RECORDS[3:])
+
+    assert path.stat().st_size == complete + sum(len(r.encode()) for r in RECORDS[3:])
+    expected = RECORDS[:2] + RECORDS[3:]
+    assert [_fields(r) for r in read_records(path)] == [_fields(r) for r in expected]
+
+
+def test_empty_files_have_no_records(tmp_path):
+    empty = tmp_path / "empty.ttr"
+    empty.touch()
+    header_only = tmp_path / "header.ttr"
+    _write(header_only, [])
+
+    assert list(read_records(empty)) == []
+    assert list(read_records(header_only)) == []
+
+
+def test_bad_magic_raises(tmp_path):
+    path = tmp_path / "games.ttr"
+    path.write_bytes(b"NOPE" + RECORDS[0].encode())
+
+    with pytest.raises(ValueError):
+        list(read_records(path))
+    with pytest.raises(ValueError):
+        GameRecordWriter(path)
+    # the writer must not have touched the file
+    assert path.read_bytes() == b"NOPE" + RECORDS[0].encode()
@@ -0,0 +1,219 @@
+import io
+import struct
+
+import pygame
+import pytest
+
+from themes.gif import DEFAULT_DELAY_MS, decode_gif, lzw_decode
+
+RED = (255, 0, 0)
+GREEN = (0, 255, 0)
+BLUE = (0, 0, 255)
+WHITE = (255, 255, 255)
+CLEAR = (0, 0, 0, 0)
+
+
+def _lzw(indexes: bytes, min_code_size: int) -> bytes:
+    """Encode palette indexes as GIF LZW data.
+
+    A clear code follows every two literals, so the table never grows
+    past the first code size: a valid stream that keeps the encoder short.
+    """
+    clear = 1 << min_code_size
+    size = min_code_size + 1
+    codes = []
+    for i, index in enumerate(indexes):
+        if not i % 2:
+            codes.append(clear)
+        codes.append(index)
+    codes.append(clear + 1)
+
+    acc = 0
+    for i, code in enumerate(codes):
+        acc |= code << (i * size)
+    return acc.to_bytes(-(-len(codes) * size // 8), "little")
+
+
+def _sub_blocks(data: bytes) -> bytes:
+    out = b""
+    for i in range(0, len(data), 255):
+        chunk = data[i : i + 255]
+        out += bytes((len(chunk),)) + chunk
+    return out + b"\x00"
+
+
+def _palette(colors) -> tuple[int, bytes]:
+    """Size bits and color table bytes, padded to a power of two."""
+    bits = max(len(colors) - 1, 1).bit_length()
+    padded = list(colors) + [(0, 0, 0)] * ((1 << bits) - len(colors))
+    return bits - 1, b"".join(bytes(color) for color in padded)
+
+
+def _frame(indexes, size, pos=(0, 0), palette=None, interlaced=False,
+           disposal=0, transparent=None, delay=10) -> bytes:
+    """Graphic control extension and image block for one frame."""
+    flags = (disposal << 2) | (transparent is not None)
+    control = struct.pack("<BHB", flags, delay, transparent or 0)
+    out = b"\x21\xf9\x04" + control + b"\x00"
+
+    packed = 0x40 if interlaced else 0
+    table = b""
+    if palette is not None:
+        bits, table = _palette(palette)
+        packed |= 0x80 | bits
+    out += b"\x2c" + struct.pack("<HHHHB", *pos, *size, packed) + table
+
+    min_code_size = 2 if palette is None else max(bits + 1, 2)
+    image_data = _lzw(bytes(indexes), min_code_size)
+    return out + bytes((min_code_size,)) + _sub_blocks(image_data)
+
+
+def _gif(size, frames, palette=(RED, GREEN, BLUE, WHITE)) -> bytes:
+    header = b"GIF89a" + struct.pack("<HHBBB", *size, 0, 0, 0)
+    table = b""
+    if palette is not None:
+        bits, table = _palette(palette)
+        header = b"GIF89a" + struct.pack("<HHBBB", *size, 0x80 | bits, 0, 0)
+    return header + table + b"".join(frames) + b"\x3b"
+
+
+def _pixels(surface: pygame.Surface) -> list[list[tuple]]:
+    width, height = surface.get_size()
+    return [[tuple(surface.get_at((x, y))) for x in range(width)] for y in range(height)]
+
+
+def test_lzw_decode_with_growing_code_size():
+    # 10x10 sample image whose codes grow from 3 to 5 bits
+    data = bytes.fromhex("8C2D99872A1CDC33A00275EC95FAA8DE608C04914C01")
+    rows = [
+        [1] * 5 + [2] * 5,
+        [1] * 5 + [2] * 5,
+        [1] * 5 + [2] * 5,
+        [1] * 3 + [0] * 4 + [2] * 3,
+        [1] * 3 + [0] * 4 + [2] * 3,
+        [2] * 3 + [0] * 4 + [1] * 3,
+        [2] * 3 + [0] * 4 + [1] * 3,
+        [2] * 5 + [1] * 5,
+        [2] * 5 + [1] * 5,
+        [2] * 5 + [1] * 5,
+    ]
+    assert lzw_decode(data, 2, 100) == bytes(sum(rows, []))
+
+
+def test_single_frame_matches_pygame():
+    indexes = [0, 1, 2, 3, 3, 2, 1, 0, 1, 1, 2, 2]
+    data = _gif((4, 3), [_frame(indexes, (4, 3))])
+
+    (width, height), frames = decode_gif(data)
+
+    assert (width, height) == (4, 3)
+    assert len(frames) == 1
+    surface, delay = frames[0]
+    assert delay == 100
+    loaded = pygame.image.load(io.BytesIO(data), "frame.gif")
+    assert _pixels(surface) == _pixels(loaded)
+
+
+def test_interlaced_frame_rows_are_reordered():
+    rows = [[y % 4] * 3 for y in range(10)]
+    # interlaced data stores rows pass by pass: 0, 8, 4, 2, 6, 1, 3, 5, 7, 9
+    order = [0, 8, 4, 2, 6, 1, 3, 5, 7, 9]
+    interlaced = sum((rows[y] for y in order), [])
+    progressive = sum(rows, [])
+
+    data = _gif((3, 10), [_frame(interlaced, (3, 10), interlaced=True)])
+    _, [(surface, _)] = decode_gif(data)
+    _, [(expected, _)] = decode_gif(_gif((3, 10), [_frame(progressive, (3, 10))]))
+
+    assert _pixels(surface) == _pixels(expected)
+    assert _pixels(surface) == _pixels(pygame.image.load(io.BytesIO(data), "i.gif"))
+    colors = (RED, GREEN, BLUE, WHITE)
+    assert [surface.get_at((0, y))[:3] for y in range(10)] == [
+        colors[y % 4] for y in range(10)
+    ]
+
+
+def test_local_palette_overrides_global_one_for_its_frame():
+    local = [(10, 20, 30), (40, 50, 60)]
+    data = _gif(
+        (2, 1),
+        [
+            _frame([0, 1], (2, 1), palette=local),
+            _frame([0, 1], (2, 1)),
+        ],
+    )
+
+    _, frames = decode_gif(data)
+
+    assert _pixels(frames[0][0]) == [[(10, 20, 30, 255), (40, 50, 60, 255)]]
+    assert _pixels(frames[1][0]) == [[(*RED, 255), (*GREEN, 255)]]
+
+
+def test_frame_without_any_palette_raises():
+    data = _gif((1, 1), [_frame([0], (1, 1))], palette=None)
+    with pytest.raises(ValueError):
+        decode_gif(data)
+
+
+def test_transparent_pixels_keep_the_previous_frame():
+    data = _gif(
+        (2, 1),
+        [
+            _frame([0, 0], (2, 1)),
+            _frame([3, 1], (2, 1), transparent=3),
+        ],
+    )
+
+    _, frames = decode_gif(data)
+
+    assert _pixels(frames[1][0]) == [[(*RED, 255), (*GREEN, 255)]]
+
+
+def test_disposal_to_background_clears_the_frame_area():
+    data = _gif(
+        (2, 2),
+        [
+            _frame([0, 0, 0, 0], (2, 2)),
+            _frame([1], (1, 1), pos=(1, 1), disposal=2),
+            _frame([2], (1, 1), pos=(0, 0)),
+        ],
+    )
+
+    _, frames = decode_gif(data)
+
+    red = (*RED, 255)
+    assert _pixels(frames[1][0]) == [[red, red], [red, (*GREEN, 255)]]
+    # the green pixel is cleared after frame 1 was shown
+    assert _pixels(frames[2][0]) == [[(*BLUE, 255), red], [red, CLEAR]]
+
+
+def test_disposal_to_previous_restores_the_canvas():
+    data = _gif(
+        (2, 1),
+        [
+            _frame([0, 0], (2, 1)),
+            _frame([1, 1], (2, 1), disposal=3),
+            _frame([2], (1, 1), pos=(1, 0)),
+        ],
+    )
+
+    _, frames = decode_gif(data)
+
+    assert _pixels(frames[1][0]) == [[(*GREEN, 255), (*GREEN, 255)]]
+    assert _pixels(frames[2][0]) == [[(*RED, 255), (*BLUE, 255)]]
+
+
+def test_frame_delays():
+    data = _gif(
+        (1, 1),
+        [_frame([0], (1, 1), delay=5), _frame([0], (1, 1), delay=0)],
+    )
+
+    _, frames = decode_gif(data)
+
+    assert [delay for _, delay in frames] == [50, DEFAULT_DELAY_MS]
+
+
+def test_not_a_gif_raises():
+    with pytest.raises(ValueError):
+        decode_gif(b"\x89PNG\r\n\x1a\n")